@@ -0,0 +1,151 @@
+"""
+Response caching for read-heavy endpoints.
+
+Responses are cached with fastapi-cache2, in Redis when REDIS_URL is set
+(so all workers share them) or in process otherwise. Any chat write
+invalidates every cached response. In process that just drops the entries;
+in Redis, cache keys include a generation token that writes bump, so
+invalidating never scans the (shared) keyspace and old entries age out.
+
+Query results are cached in the same backend under their own prefix, keyed
+by the normalized query, and simply expire. The source finder keeps its
+expanded queries and fetched pages there too, so with Redis, workers and
+restarts reuse them. Without Redis these values live in a bounded per-process
+LRU rather than fastapi-cache2's InMemoryBackend, which never evicts and only
+drops an expired entry when its key is read again.
+"""
+
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import uuid
+
+import orjson
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis.asyncio import Redis
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config.settings import settings
+from app.services.ttl_cache import TTLCache
+
+CACHE_PREFIX = "sf-cache"
+_GENERATION_KEY = f"{CACHE_PREFIX}:generation"
+
+# Query results live outside CACHE_PREFIX so chat writes don't invalidate them
+QUERY_CACHE_PREFIX = "pq"
+QUERY_RESULT_TTL = 600  # Short, so news and web results stay fresh
+EXPANDED_QUERY_PREFIX = "eq"
+PAGE_CACHE_PREFIX = "page"
+# Values (query results, expansions, pages) kept per process when there's no Redis
+LOCAL_VALUE_CACHE_SIZE = 512
+
+_redis: Optional[Redis] = None
+_values: Optional[RedisBackend] = None
+_local_values: Optional[TTLCache] = None
+
+async def init_cache() -> None:
+    """Set up the response cache backend; called once from the app lifespan."""
+    global _redis, _values, _local_values
+    if settings.REDIS_URL:
+        _redis = Redis.from_url(settings.REDIS_URL)
+        _values = RedisBackend(_redis)
+        FastAPICache.init(_values, prefix=CACHE_PREFIX)
+    else:
+        _local_values = TTLCache(LOCAL_VALUE_CACHE_SIZE, QUERY_RESULT_TTL)
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
+
+async def close_cache() -> None:
+    """Close the cache's Redis connection, if any."""
+    global _redis, _values, _local_values
+    _values = None
+    _local_values = None
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+async def invalidate_cache() -> None:
+    """Invalidate every cached response (call after any chat write)."""
+    if _redis is None:
+        await FastAPICache.clear()
+    else:
+        await _redis.set(_GENERATION_KEY, uuid.uuid4().hex)
+
+async def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: tuple = (),
+    kwargs: Optional[dict] = None
+) -> str:
+    """Key a cached response by path and sorted query parameters (and generation, in Redis)."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    if _redis is None:
+        return f"{namespace}:{request.url.path}?{query}"
+    
+    generation = await _redis.get(_GENERATION_KEY)
+    return f"{namespace}:{generation.decode() if generation else '0'}:{request.url.path}?{query}"
+
+def query_cache_key(query: str, source_filters: Optional[List[str]] = None) -> str:
+    """Key a query result by the normalized query text and source filters."""
+    normalized = query.strip().lower() + "|" + orjson.dumps(sorted(source_filters or [])).decode()
+    return f"{QUERY_CACHE_PREFIX}:{hashlib.md5(normalized.encode()).hexdigest()}"
+
+def hashed_key(prefix: str, text: str) -> str:
+    """Key a cached value by a hash of arbitrary text (a URL, a prompt)."""
+    return f"{prefix}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+async def get_cached_value(key: str) -> Any:
+    """Get a JSON value from the shared cache, or None on a miss or before init_cache."""
+    if _values is not None:
+        cached = await _values.get(key)
+    elif _local_values is not None:
+        cached = _local_values.get(key)
+    else:
+        return None
+    return orjson.loads(cached) if cached else None
+
+async def set_cached_value(key: str, value: Any, expire: int) -> None:
+    """Cache a JSON value for ``expire`` seconds (a no-op before init_cache)."""
+    if _values is not None:
+        await _values.set(key, orjson.dumps(value, default=str), expire=expire)
+    elif _local_values is not None:
+        # Stored serialized, so callers get a fresh copy on every read
+        _local_values.set(key, orjson.dumps(value, default=str), ttl=expire)
+
+async def get_query_result(key: str) -> Optional[Dict[str, Any]]:
+    """Get a cached query result ({"content", "sources"}), or None on a miss."""
+    return await get_cached_value(key)
+
+async def set_query_result(key: str, result: Dict[str, Any], expire: int = QUERY_RESULT_TTL) -> None:
+    """Cache a query result for ``expire`` seconds."""
+    await set_cached_value(key, result, expire)
+
+def cached_response(expire: int, namespace: str) -> Callable:
+    """
+    Cache an endpoint's response for up to ``expire`` seconds.
+    
+    Clients are told to revalidate (``Cache-Control: no-cache``) instead of
+    reusing the response for ``expire`` seconds, so they see writes right
+    away. The ETag fastapi-cache2 sends is Python's per-process ``hash()``
+    of the payload, so clients shouldn't count on 304s from it.
+    """
+    def decorator(func: Callable) -> Callable:
+        cached_func = cache(expire=expire, namespace=namespace, key_builder=request_key_builder)(func)
+        
+        @wraps(cached_func)
+        async def inner(*args, **kwargs):
+            response = kwargs.get("__fastapi_cache_response")
+            result = await cached_func(*args, **kwargs)
+            if response is not None:
+                response.headers["Cache-Control"] = "no-cache"
+            return result
+        
+        return inner
+    
+    return decorator
\ No newline at end of file
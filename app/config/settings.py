@@ -1,4 +1,5 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -14,8 +15,32 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Chat memory settings
+    SESSIONS_DIR: Optional[str] = "sessions"  # Set empty to disable persistence
+    MAX_SESSIONS: int = 1024  # Sessions kept resident in memory (LRU)
+    MAX_MESSAGES_PER_SESSION: int = 10_000  # Oldest messages drop off past this
+    
+    # Redis chat memory (used instead of the in-process store when REDIS_URL is set)
+    REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    SESSION_TTL_SECONDS: int = 7 * 24 * 3600
+    
+    # Server workers when DEBUG is off (one per CPU with REDIS_URL, otherwise 1)
+    WORKERS: Optional[int] = None
+    
+    # Logging (use WARNING in production to skip per-request messages)
+    LOG_LEVEL: str = "INFO"
+    
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading the environment and .env only once.
+    
+    Use as a FastAPI dependency (``Depends(get_settings)``) so tests can swap
+    it out through ``app.dependency_overrides``.
+    """
+    return Settings()
 
-settings = Settings() 
\ No newline at end of file
+settings = get_settings() 
\ No newline at end of file
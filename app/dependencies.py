@@ -0,0 +1,28 @@
+"""
+FastAPI dependencies for the SourceFinder application.
+
+Services are created once in the lifespan (see app.main) and stored on
+app.state; these accessors hand them to route handlers.
+"""
+
+from fastapi import Request
+from app.memory import ChatStore
+from app.services.source_finder import SourceFinder
+from app.locks import SessionLocks
+from app.verification import SourceVerifier
+
+def get_chat_memory(request: Request) -> ChatStore:
+    """Get the application's shared chat memory store."""
+    return request.app.state.chat_memory
+
+def get_source_finder(request: Request) -> SourceFinder:
+    """Get the application's shared source finder."""
+    return request.app.state.source_finder
+
+def get_session_locks(request: Request) -> SessionLocks:
+    """Get the application's per-session locks."""
+    return request.app.state.session_locks
+
+def get_source_verifier(request: Request) -> SourceVerifier:
+    """Get the application's shared source verifier."""
+    return request.app.state.source_verifier
\ No newline at end of file
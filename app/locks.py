@@ -0,0 +1,38 @@
+"""
+Per-session locks for serializing work on one chat session.
+
+Requests for the same session run one at a time so each sees the history
+the previous one wrote; requests for different sessions stay concurrent.
+Locks are only held weakly, so a session's lock goes away once no request
+is using it.
+"""
+
+import asyncio
+from weakref import WeakValueDictionary
+
+class SessionLocks:
+    """Map of session ID to an asyncio.Lock, created on first use."""
+    
+    def __init__(self):
+        """Initialize an empty lock map."""
+        self._locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+    
+    def __call__(self, session_id: str) -> asyncio.Lock:
+        """
+        Get the lock for a session.
+        
+        Args:
+            session_id: Session to lock
+        
+        Returns:
+            The session's lock; callers keep it alive by holding it
+        """
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+    
+    def __len__(self) -> int:
+        """Number of locks currently in use."""
+        return len(self._locks)
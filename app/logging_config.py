@@ -0,0 +1,50 @@
+"""
+Logging setup for the SourceFinder application.
+
+Application loggers live under the ``sourcefinder`` namespace. Records are
+handed to a QueueHandler and written by a QueueListener thread, so log I/O
+never blocks the event loop; LOG_LEVEL gates what is emitted at all.
+"""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.config.settings import settings
+
+LOGGER_NAME = "sourcefinder"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: str = settings.LOG_LEVEL) -> None:
+    """Route ``sourcefinder`` logs through a background writer; called once from the app lifespan."""
+    global _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level.upper())
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    
+    _listener.stop()
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+    _listener = None
@@ -7,7 +7,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.routes import router
 from app.services.source_finder import SourceFinder
-from app.memory.chat_memory import ChatMemory
+from app.memory import create_chat_memory
+from app.cache import init_cache, close_cache
+from app.locks import SessionLocks
+from app.verification import SourceVerifier
+from app.logging_config import setup_logging, shutdown_logging
+import logging
+
+logger = logging.getLogger("sourcefinder.main")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -16,24 +23,33 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     # Initialize services on startup
-    app.state.source_finder = SourceFinder()
-    app.state.chat_memory = ChatMemory()
+    setup_logging()
     
-    # Make services available globally
-    app.router.source_finder = app.state.source_finder
-    app.router.chat_memory = app.state.chat_memory
+    # Handlers get these via app.dependencies
+    app.state.source_finder = await SourceFinder.create()
+    app.state.chat_memory = create_chat_memory()
+    app.state.session_locks = SessionLocks()
+    app.state.source_verifier = SourceVerifier()
+    await app.state.chat_memory.start()
+    await init_cache()
     
-    print("✅ API services initialized successfully")
+    logger.info("✅ API services initialized successfully")
     
     yield
     
-    # Cleanup on shutdown
+    # Cleanup on shutdown, writing out any queued session log records first
+    await app.state.chat_memory.aclose()
+    await close_cache()
+    
     if hasattr(app.state.source_finder, 'close_session'):
         try:
             await app.state.source_finder.close_session()
-            print("✅ Resources cleaned up on shutdown")
-        except Exception as e:
-            print(f"❌ Error during cleanup: {e}")
+            logger.info("✅ Resources cleaned up on shutdown")
+        except Exception:
+            logger.exception("❌ Error during cleanup")
+    
+    # Last, so records logged during shutdown are still written
+    shutdown_logging()
 
 # Create FastAPI application
 app = FastAPI(
@@ -56,7 +72,7 @@ app.add_middleware(
 app.include_router(router)
 
 @app.get("/")
-async def root():
+async def root() -> dict:
     """
     Root endpoint that returns API information.
     """
@@ -69,7 +85,7 @@ async def root():
 
 # Health check endpoint
 @app.get("/health")
-async def health_check():
+async def health_check() -> dict:
     """
     Health check endpoint.
     
@@ -1 +1,21 @@
+"""
+Chat memory stores.
 
+ChatMemory keeps sessions in process (mirrored to JSONL logs);
+RedisChatMemory keeps them in Redis so every worker shares them. Both
+expose the same async API.
+"""
+
+from typing import Union
+
+from app.config.settings import settings
+from app.memory.chat_memory import ChatMemory
+from app.memory.redis_chat_memory import RedisChatMemory
+
+ChatStore = Union[ChatMemory, RedisChatMemory]
+
+def create_chat_memory() -> ChatStore:
+    """Create the configured chat store: Redis if REDIS_URL is set, in-process otherwise."""
+    if settings.REDIS_URL:
+        return RedisChatMemory.from_url(settings.REDIS_URL)
+    return ChatMemory()
\ No newline at end of file
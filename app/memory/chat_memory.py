@@ -1,115 +1,576 @@
 """
 Chat memory management module for storing and retrieving chat history.
+
+Sessions are held in memory and mirrored to an append-only JSONL log per
+session (``<SESSIONS_DIR>/<session_id>.jsonl``), so persisting a message is
+a single line append no matter how long the conversation gets.
+
+While the app is running, log writes are queued and flushed by a background
+task (see ``start_writer``) so requests never wait on disk I/O.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, TextIO, Callable, Tuple, KeysView, Sequence, Final
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections import OrderedDict
 from datetime import datetime
-import json
+from itertools import islice
 import os
 from pathlib import Path
+import re
+import time
 import uuid
 
-from app.schemas.chat import Message, ChatSession
+import orjson
+
+from app.config.settings import settings
+from app.schemas.chat import Message, StoredMessage, ChatSession, DEFAULT_TITLE
+
+# Under the "sourcefinder" namespace, so records reach the app's queued log handler
+logger = logging.getLogger("sourcefinder.chat_memory")
+
+# Session IDs come from clients, so only these are used as log file names
+SAFE_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+# Longest title taken from a session's first user message before truncating
+TITLE_MAX_LEN: Final[int] = 50
+
+# Most queued log operations written in one background flush
+WRITE_BATCH_SIZE: Final[int] = 64
+
+# A queued log operation: ("append", session_id, line), ("close", session_id, None)
+# or ("delete", session_id, None)
+LogOp = Tuple[str, str, Optional[str]]
+
+def title_from(content: str) -> str:
+    """Derive a session title from its first user message, truncating if too long."""
+    if len(content) > TITLE_MAX_LEN:
+        return content[:TITLE_MAX_LEN] + "..."
+    return content
+
+def source_key(source: Any) -> Optional[str]:
+    """Key a cited source for deduplication: its link, else its title."""
+    if not isinstance(source, dict):
+        return None
+    return source.get("link") or source.get("title")
+
+class SessionCache(OrderedDict):
+    """
+    LRU mapping of session ID to ChatSession.
+    
+    Reads and writes mark a session as most recently used. Once more than
+    ``maxsize`` sessions are resident, the least recently used one is evicted
+    and handed to ``on_evict``.
+    """
+    
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[str, ChatSession], None]] = None):
+        """Initialize an empty cache holding at most ``maxsize`` sessions."""
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+    
+    def __getitem__(self, session_id: str) -> ChatSession:
+        session = super().__getitem__(session_id)
+        self.move_to_end(session_id)
+        return session
+    
+    def get(self, session_id: str, default: Optional[ChatSession] = None) -> Optional[ChatSession]:
+        session = super().get(session_id)
+        if session is None:
+            return default
+        self.move_to_end(session_id)
+        return session
+    
+    def peek(self, session_id: str) -> Optional[ChatSession]:
+        """Get a session without marking it as recently used."""
+        return super().get(session_id)
+    
+    def __setitem__(self, session_id: str, session: ChatSession) -> None:
+        super().__setitem__(session_id, session)
+        self.move_to_end(session_id)
+        
+        while len(self) > self.maxsize:
+            evicted_id, evicted = self.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(evicted_id, evicted)
 
 class ChatMemory:
-    """In-memory store for chat sessions and messages."""
+    """
+    In-memory store for chat sessions and messages.
+    
+    The public methods are coroutines so routes can use this store and
+    RedisChatMemory interchangeably.
+    """
     
-    def __init__(self):
-        """Initialize the chat memory store."""
-        self.sessions: Dict[str, ChatSession] = {}
+    def __init__(self, sessions_dir: Optional[str] = settings.SESSIONS_DIR, max_sessions: int = settings.MAX_SESSIONS):
+        """
+        Initialize the chat memory store.
+        
+        Args:
+            sessions_dir: Directory for the per-session JSONL logs. Falsy disables persistence.
+            max_sessions: Maximum number of sessions kept resident in memory.
+        """
+        self.sessions: SessionCache = SessionCache(max_sessions, on_evict=self._on_evict)
         self.current_session_id = None
+        
+        # (updated_at_ts, session_id) pairs kept sorted, oldest first
+        self._by_updated: List[Tuple[float, str]] = []
+        
+        # Open append handles, one per session log (owned by the writer once started)
+        self._fh: Dict[str, TextIO] = {}
+        
+        # Background writer state: queued log operations, how many are still
+        # unwritten per session, and evicted sessions kept until theirs land
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._unflushed: Dict[str, int] = {}
+        self._evicted_unflushed: Dict[str, ChatSession] = {}
+        self.sessions_dir = Path(sessions_dir) if sessions_dir else None
+        if self.sessions_dir:
+            self.sessions_dir.mkdir(parents=True, exist_ok=True)
+            self._load_sessions()
     
-    def create_session(self, session_id: Optional[str] = None) -> str:
-        """Create a new chat session."""
-        if not session_id:
-            session_id = str(uuid.uuid4())
+    def _session_path(self, session_id: str) -> Path:
+        """Get the JSONL log path for a session."""
+        return self.sessions_dir / f"{session_id}.jsonl"
+    
+    def _append_record(self, session_id: str, record: Dict[str, Any]) -> None:
+        """Append a single record to the session's JSONL log."""
+        self._append_records(session_id, [record])
+    
+    def _append_records(self, session_id: str, records: List[Dict[str, Any]]) -> None:
+        """Append records to the session's JSONL log as one write."""
+        if not self.sessions_dir or not SAFE_SESSION_ID.match(session_id):
+            return
+        
+        self._submit(("append", session_id, "".join(orjson.dumps(record, default=str).decode() + "\n" for record in records)))
+    
+    def _submit(self, op: LogOp) -> None:
+        """Queue a log operation for the writer, or apply it now if none is running."""
+        if self._write_queue is None:
+            self._apply_ops([op])
+            return
+        
+        session_id = op[1]
+        self._unflushed[session_id] = self._unflushed.get(session_id, 0) + 1
+        self._write_queue.put_nowait(op)
+    
+    def _apply_ops(self, ops: List[LogOp]) -> None:
+        """Apply log operations in order, flushing each touched log once."""
+        dirty = set()
+        for kind, session_id, line in ops:
+            if kind == "append":
+                fh = self._fh.get(session_id)
+                if fh is None:
+                    fh = open(self._session_path(session_id), "a", encoding="utf-8")
+                    self._fh[session_id] = fh
+                fh.write(line)
+                dirty.add(session_id)
+            else:
+                dirty.discard(session_id)
+                self._close_handle(session_id)
+                if kind == "delete":
+                    self._session_path(session_id).unlink(missing_ok=True)
+        
+        for session_id in dirty:
+            self._fh[session_id].flush()
+    
+    async def _flush_loop(self, queue: asyncio.Queue) -> None:
+        """Write queued log operations in batches until a stop sentinel arrives."""
+        stopping = False
+        while not stopping:
+            batch = [await queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            ops = [op for op in batch if op is not None]
+            stopping = len(ops) < len(batch)
+            try:
+                await asyncio.to_thread(self._apply_ops, ops)
+            except Exception:
+                logger.exception("❌ Error writing session logs")
+            self._mark_flushed(ops)
+        
+        # Anything queued after the sentinel is written inline
+        self._write_queue = None
+        leftover = []
+        while not queue.empty():
+            op = queue.get_nowait()
+            if op is not None:
+                leftover.append(op)
+        self._apply_ops(leftover)
+        self._mark_flushed(leftover)
+    
+    def _mark_flushed(self, ops: List[LogOp]) -> None:
+        """Update per-session unwritten counts after a batch is on disk."""
+        for _, session_id, _ in ops:
+            remaining = self._unflushed.get(session_id, 0) - 1
+            if remaining > 0:
+                self._unflushed[session_id] = remaining
+            else:
+                self._unflushed.pop(session_id, None)
+                self._evicted_unflushed.pop(session_id, None)
+    
+    def start_writer(self) -> None:
+        """Start flushing log writes from a background task on the running loop."""
+        if self._writer_task is not None or not self.sessions_dir:
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        self._write_queue = queue
+        self._writer_task = asyncio.create_task(self._flush_loop(queue))
+    
+    async def stop_writer(self) -> None:
+        """Drain queued log writes and stop the background writer."""
+        if self._writer_task is None:
+            return
+        
+        self._write_queue.put_nowait(None)
+        await self._writer_task
+        self._writer_task = None
+    
+    def _close_handle(self, session_id: str) -> None:
+        """Close the JSONL handle for a session if one is open."""
+        fh = self._fh.pop(session_id, None)
+        if fh is not None:
+            fh.close()
+    
+    def _index_add(self, session: ChatSession) -> None:
+        """Insert a session into the updated_at index."""
+        insort(self._by_updated, (session.updated_at_ts, session.session_id))
+    
+    def _index_remove(self, session: ChatSession) -> None:
+        """Remove a session from the updated_at index."""
+        key = (session.updated_at_ts, session.session_id)
+        i = bisect_left(self._by_updated, key)
+        if i < len(self._by_updated) and self._by_updated[i] == key:
+            del self._by_updated[i]
+    
+    def _touch(self, session: ChatSession, now: float) -> None:
+        """Set a session's update time, keeping the index ordered."""
+        self._index_remove(session)
+        session.updated_at_ts = now
+        session.updated_at = datetime.fromtimestamp(now)
+        self._index_add(session)
+    
+    def _on_evict(self, session_id: str, session: ChatSession) -> None:
+        """Release resources held by a session pushed out of the LRU cache."""
+        self._index_remove(session)
+        
+        # Its log may not be fully written yet; keep it until it is so a
+        # restore doesn't replay a stale log
+        if session_id in self._unflushed:
+            self._evicted_unflushed[session_id] = session
+        self._submit(("close", session_id, None))
+        logger.debug("♻️ Evicted session %s from memory", session_id)
+    
+    def _replay_log(self, path: Path) -> Optional[ChatSession]:
+        """Rebuild a session by replaying its JSONL log."""
+        session = None
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Skip torn writes (e.g. a crash mid-append)
+                    continue
+                
+                record_type = record.get("type")
+                if record_type == "session_metadata":
+                    session = ChatSession(
+                        session_id=record["session_id"],
+                        created_at=record["created_at"],
+                        updated_at=record["updated_at"]
+                    )
+                    updated_at = record["updated_at"]
+                elif session is None:
+                    continue
+                elif record_type == "message":
+                    # Logged messages were validated when written
+                    self._apply_message(session, StoredMessage(**record["message"]))
+                    updated_at = record["updated_at"]
+                elif record_type == "session_update":
+                    if record.get("cleared"):
+                        session.messages.clear()
+                        session._sources_index.clear()
+                        session.title = DEFAULT_TITLE
+                    if "title" in record:
+                        session.title = record["title"]
+                    updated_at = record["updated_at"]
+        
+        # Only the final update time matters, so parse it once
+        if session:
+            session.updated_at = datetime.fromisoformat(updated_at)
+            session.updated_at_ts = session.updated_at.timestamp()
+        
+        return session
+    
+    def _load_sessions(self) -> None:
+        """Load the most recently written sessions from the sessions directory."""
+        paths = sorted(self.sessions_dir.glob("*.jsonl"), key=lambda path: path.stat().st_mtime)
+        for path in paths[-self.sessions.maxsize:]:
+            session = self._replay_log(path)
+            if session:
+                self.sessions[session.session_id] = session
+                self._index_add(session)
+    
+    def _read_log(self, session_id: str) -> Optional[ChatSession]:
+        """Replay a session's log if it has one (blocking; run in a worker thread)."""
+        path = self._session_path(session_id)
+        if not path.exists():
+            return None
+        return self._replay_log(path)
+    
+    async def _restore_session(self, session_id: str) -> Optional[ChatSession]:
+        """Reload an evicted session from its log. Returns None if it has no log."""
+        if not self.sessions_dir or not SAFE_SESSION_ID.match(session_id):
+            return None
+        
+        session = self._evicted_unflushed.pop(session_id, None)
+        if session is None:
+            # Replaying a long log is disk-bound, so keep it off the event loop
+            session = await asyncio.to_thread(self._read_log, session_id)
+            
+            # Another request may have restored or created it meanwhile
+            resident = self.sessions.get(session_id)
+            if resident:
+                return resident
+            if not session:
+                return None
+        
+        self.sessions[session_id] = session
+        self._index_add(session)
+        return session
+    
+    def close(self) -> None:
+        """Close all open JSONL handles (after stop_writer, if the writer was started)."""
+        for session_id in list(self._fh):
+            self._close_handle(session_id)
+    
+    async def start(self) -> None:
+        """Start background work; called once from the app lifespan."""
+        self.start_writer()
+    
+    async def aclose(self) -> None:
+        """Write out queued log records and release file handles on shutdown."""
+        await self.stop_writer()
+        self.close()
+    
+    def _create_session_obj(self, session_id: str) -> ChatSession:
+        """Create, store and log a new session, replacing any existing one."""
+        existing = self.sessions.peek(session_id)
+        if existing:
+            self._index_remove(existing)
         
-        self.sessions[session_id] = ChatSession(
+        now = time.time()
+        now_dt = datetime.fromtimestamp(now)
+        session = ChatSession(
             session_id=session_id,
-            messages=[],
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
+            created_at=now_dt,
+            updated_at=now_dt,
+            updated_at_ts=now
         )
+        self.sessions[session_id] = session
+        self._index_add(session)
+        self._append_record(session_id, {
+            "type": "session_metadata",
+            "session_id": session_id,
+            "created_at": now_dt.isoformat(),
+            "updated_at": now_dt.isoformat()
+        })
         
         # Set as current session
         self.current_session_id = session_id
         
-        return session_id
+        return session
+    
+    async def create_session(self, session_id: Optional[str] = None) -> str:
+        """Create a new chat session."""
+        return self._create_session_obj(session_id or uuid.uuid4().hex).session_id
+    
+    async def create_chat_session(self, session_id: Optional[str] = None) -> ChatSession:
+        """Create a new chat session and return it rather than its ID."""
+        return self._create_session_obj(session_id or uuid.uuid4().hex)
+    
+    async def _lookup(self, session_id: str) -> Optional[ChatSession]:
+        """Get a resident session, restoring it if evicted, or None if it doesn't exist."""
+        return self.sessions.get(session_id) or await self._restore_session(session_id)
     
-    def get_current_session(self) -> Optional[ChatSession]:
+    async def get_session(self, session_id: str) -> Optional[ChatSession]:
+        """Get a chat session by ID, None if it doesn't exist."""
+        return await self._lookup(session_id)
+    
+    async def get_current_session(self) -> Optional[ChatSession]:
         """Get the current chat session."""
-        if not self.current_session_id or self.current_session_id not in self.sessions:
+        if not self.current_session_id:
             return None
         
-        return self.sessions[self.current_session_id]
+        return self.sessions.get(self.current_session_id)
+    
+    async def get_current_session_id(self) -> Optional[str]:
+        """Get the current session's ID without loading the session."""
+        if self.current_session_id in self.sessions:
+            return self.current_session_id
+        return None
     
-    def add_message(self, session_id: str, message: Message) -> bool:
+    @staticmethod
+    def _apply_message(session: ChatSession, message: StoredMessage) -> None:
+        """Append a message to a session, titling it after the first user message."""
+        session.messages.append(message)
+        
+        if message.role == "assistant" and message.sources:
+            # First citation of a source wins, so repeats across turns are dropped
+            for source in message.sources:
+                key = source_key(source)
+                if key:
+                    session._sources_index.setdefault(key, source)
+        
+        if session.title == DEFAULT_TITLE and message.role == "user":
+            session.title = title_from(message.content)
+    
+    async def add_message(self, session_id: str, message: Message) -> bool:
         """Add a message to a chat session."""
-        # Create session if it doesn't exist
-        if session_id not in self.sessions:
-            self.create_session(session_id)
+        return await self.add_messages(session_id, [message])
+    
+    async def add_messages(self, session_id: str, messages: List[Message]) -> bool:
+        """
+        Add several messages to a chat session at once.
         
-        # Add message and update timestamp
-        session = self.sessions[session_id]
-        session.messages.append(message)
-        session.updated_at = datetime.now().isoformat()
+        The session is looked up, touched and logged once for the whole batch.
+        
+        Args:
+            session_id: Session to add to; created if it doesn't exist
+            messages: Messages to append, in order
+            
+        Returns:
+            True once the messages are added
+        """
+        if not messages:
+            return True
+        
+        # Create session if it doesn't exist (or bring it back if it was evicted)
+        session = await self._lookup(session_id) or self._create_session_obj(session_id)
+        
+        # Add messages and update timestamp
+        for message in messages:
+            self._apply_message(session, StoredMessage.from_message(message))
+        self._touch(session, time.time())
+        
+        updated_at = session.updated_at.isoformat()
+        self._append_records(session_id, [
+            {"type": "message", "updated_at": updated_at, "message": message.model_dump()}
+            for message in messages
+        ])
         
         # Update current session
         self.current_session_id = session_id
         
         return True
     
-    def get_messages(self, session_id: str) -> List[Message]:
+    async def get_messages(self, session_id: str) -> Sequence[StoredMessage]:
         """Get all messages for a chat session."""
-        if session_id not in self.sessions:
+        session = await self._lookup(session_id)
+        if session is None:
+            return []
+        
+        return session.messages
+    
+    async def get_recent_messages(self, session_id: str, limit: int) -> List[StoredMessage]:
+        """
+        Get the last messages of a chat session, oldest first.
+        
+        Args:
+            session_id: Session to read
+            limit: Maximum number of messages to return
+            
+        Returns:
+            Up to ``limit`` of the session's most recent messages
+        """
+        session = await self._lookup(session_id)
+        if session is None or limit <= 0:
             return []
         
-        return self.sessions[session_id].messages
+        # Walk back from the newest so long sessions aren't traversed or copied
+        recent = list(islice(reversed(session.messages), limit))
+        recent.reverse()
+        return recent
     
-    def get_all_sessions(self) -> List[str]:
-        """Get all session IDs."""
-        return list(self.sessions.keys())
+    async def get_chat_history(self, session_id: str) -> List[Message]:
+        """Get all messages for a chat session as Message models."""
+        return [message.to_message() for message in await self.get_messages(session_id)]
     
-    def get_session_title(self, session_id: str) -> str:
+    async def get_all_sessions(self) -> KeysView[str]:
+        """Get a live view of all resident session IDs (no copy is made)."""
+        return self.sessions.keys()
+    
+    async def get_session_title(self, session_id: str) -> str:
         """Get the title for a chat session."""
-        if session_id not in self.sessions:
-            return "New Chat"
-        
-        # Use first user message as title, or default if none exists
-        session = self.sessions[session_id]
-        for message in session.messages:
-            if message.role == "user":
-                # Truncate if too long
-                title = message.content
-                if len(title) > 50:
-                    title = title[:50] + "..."
-                return title
-        
-        return "New Chat"
-    
-    def get_session_update_time(self, session_id: str) -> str:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return DEFAULT_TITLE
+        
+        # Title is set from the first user message in add_message
+        return session.title or DEFAULT_TITLE
+    
+    async def get_session_update_time(self, session_id: str) -> str:
         """Get the update time for a chat session."""
-        if session_id not in self.sessions:
+        session = self.sessions.get(session_id)
+        if session is None:
             return datetime.now().isoformat()
         
-        return self.sessions[session_id].updated_at
+        return session.updated_at.isoformat()
     
-    def clear_session(self, session_id: str) -> bool:
+    async def clear_session(self, session_id: str) -> bool:
         """Clear all messages from a chat session."""
-        if session_id not in self.sessions:
+        session = await self._lookup(session_id)
+        if session is None:
             return False
         
-        self.sessions[session_id].messages = []
-        self.sessions[session_id].updated_at = datetime.now().isoformat()
+        session.messages.clear()
+        session._sources_index.clear()
+        session.title = DEFAULT_TITLE
+        self._touch(session, time.time())
+        self._append_record(session_id, {
+            "type": "session_update",
+            "updated_at": session.updated_at.isoformat(),
+            "cleared": True
+        })
         
         return True
     
-    def delete_session(self, session_id: str) -> bool:
+    async def update_session_title(self, session_id: str, title: str) -> bool:
+        """Update the title of a chat session."""
+        session = await self._lookup(session_id)
+        if not session:
+            return False
+        
+        session.title = title
+        self._touch(session, time.time())
+        self._append_record(session_id, {
+            "type": "session_update",
+            "updated_at": session.updated_at.isoformat(),
+            "title": title
+        })
+        
+        return True
+    
+    async def delete_session(self, session_id: str) -> bool:
         """Delete a chat session."""
-        if session_id not in self.sessions:
+        session = self.sessions.pop(session_id, None)
+        
+        # Drop the session's log along with it (evicted sessions only live there)
+        log_deleted = False
+        if self.sessions_dir and SAFE_SESSION_ID.match(session_id):
+            pending = self._evicted_unflushed.pop(session_id, None)
+            log_deleted = pending is not None or self._session_path(session_id).exists()
+            self._submit(("delete", session_id, None))
+        
+        if session is None and not log_deleted:
             return False
         
-        del self.sessions[session_id]
+        if session:
+            self._index_remove(session)
         
         # Update current session if this was the current one
         if self.current_session_id == session_id:
@@ -117,15 +578,15 @@ class ChatMemory:
         
         return True
         
-    def get_sources(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_sources(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all sources from all messages in a session.
+        Get the unique sources cited in a session.
         
         Args:
             session_id: Optional session ID. If None, uses the current session.
             
         Returns:
-            List of source dictionaries
+            List of source dictionaries, one per link (or title), in order of first citation
         """
         # Use current session if no session_id provided
         if not session_id:
@@ -134,37 +595,67 @@ class ChatMemory:
             session_id = self.current_session_id
         
         # Check if session exists
-        if session_id not in self.sessions:
+        session = await self._lookup(session_id)
+        if session is None:
             return []
         
-        # Extract sources from all messages
-        sources = []
-        for message in self.sessions[session_id].messages:
-            if message.role == "assistant" and message.sources:
-                sources.extend(message.sources)
+        return list(session._sources_index.values())
+        
+    @staticmethod
+    def _summarize(session: ChatSession) -> Dict[str, Any]:
+        """Build the listing summary for a session."""
+        last_message = ""
+        if session.messages:
+            last_message = session.messages[-1].content
         
-        return sources
+        return {
+            "session_id": session.session_id,
+            "title": session.title or DEFAULT_TITLE,
+            "last_message": last_message,
+            "created_at": session.created_at,
+            "updated_at": session.updated_at
+        }
+    
+    async def list_sessions_page(self, offset: int = 0, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        List one page of chat sessions.
         
-    def list_sessions(self) -> List[Dict[str, Any]]:
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return. None returns the rest.
+            
+        Returns:
+            List of session summaries, most recently updated first
+        """
+        stop = None if limit is None else offset + limit
+        return [
+            self._summarize(self.sessions.peek(session_id))
+            for _, session_id in islice(reversed(self._by_updated), offset, stop)
+        ]
+    
+    async def get_sessions_with_meta(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the ID, title and update time of one page of sessions in a single pass.
+        
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return. None returns the rest.
+            
+        Returns:
+            List of {"session_id", "title", "updated_at"} dicts, most recently updated first
+        """
+        stop = None if limit is None else offset + limit
+        peek = self.sessions.peek
+        return [
+            {"session_id": session.session_id, "title": session.title or DEFAULT_TITLE, "updated_at": session.updated_at}
+            for session in (peek(session_id) for _, session_id in islice(reversed(self._by_updated), offset, stop))
+        ]
+    
+    async def list_sessions(self) -> List[Dict[str, Any]]:
         """
         List all chat sessions.
         
         Returns:
-            List of session summaries
+            List of session summaries, most recently updated first
         """
-        sessions = []
-        for session_id, session in self.sessions.items():
-            last_message = ""
-            if session.messages:
-                last_message = session.messages[-1].content
-            
-            sessions.append({
-                "session_id": session_id,
-                "title": self.get_session_title(session_id),
-                "last_message": last_message,
-                "created_at": session.created_at,
-                "updated_at": session.updated_at
-            })
-        
-        # Sort by update time, most recent first
-        return sorted(sessions, key=lambda x: x["updated_at"], reverse=True) 
\ No newline at end of file
+        return await self.list_sessions_page(limit=None)
\ No newline at end of file
@@ -0,0 +1,406 @@
+"""
+Redis-backed chat memory, shared by every worker process.
+
+Key layout (each session key expires ``ttl`` seconds after its last write):
+
+- ``session:<id>:meta``: HASH of session_id, title, created_at, updated_at
+- ``session:<id>:messages``: LIST of JSON-encoded messages, oldest first
+- ``session:<id>:sources``: HASH of source key (link, else title) -> JSON-encoded source
+- ``session:<id>:source_links``: ZSET of source keys in first-cited order
+- ``sessions:index``: ZSET of session IDs scored by update time
+- ``sessions:current``: ID of the most recently written session
+"""
+
+from typing import List, Dict, Optional, Any
+from datetime import datetime
+import time
+import uuid
+
+import orjson
+from redis.asyncio import ConnectionPool, Redis
+
+from app.config.settings import settings
+from app.memory.chat_memory import title_from, source_key
+from app.schemas.chat import Message, StoredMessage, ChatSession, DEFAULT_TITLE
+
+SESSIONS_INDEX = "sessions:index"
+CURRENT_SESSION = "sessions:current"
+
+def _meta_key(session_id: str) -> str:
+    return f"session:{session_id}:meta"
+
+def _messages_key(session_id: str) -> str:
+    return f"session:{session_id}:messages"
+
+def _sources_key(session_id: str) -> str:
+    return f"session:{session_id}:sources"
+
+def _source_links_key(session_id: str) -> str:
+    return f"session:{session_id}:source_links"
+
+class RedisChatMemory:
+    """Chat session store backed by Redis, with the same async API as ChatMemory."""
+    
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = settings.SESSION_TTL_SECONDS,
+        max_messages: int = settings.MAX_MESSAGES_PER_SESSION
+    ):
+        """
+        Initialize the chat memory store.
+        
+        Args:
+            redis: Client to use. Must decode responses to str.
+            ttl: Seconds a session's keys live after its last write.
+            max_messages: Maximum number of messages kept per session.
+        """
+        self.redis = redis
+        self.ttl = ttl
+        self.max_messages = max_messages
+    
+    @classmethod
+    def from_url(cls, url: str, max_connections: int = settings.REDIS_MAX_CONNECTIONS) -> "RedisChatMemory":
+        """Create a store with its own connection pool for the given Redis URL."""
+        pool = ConnectionPool.from_url(url, max_connections=max_connections, decode_responses=True)
+        return cls(Redis.from_pool(pool))
+    
+    async def start(self) -> None:
+        """Check the connection; called once from the app lifespan."""
+        await self.redis.ping()
+    
+    async def aclose(self) -> None:
+        """Close the connection pool on shutdown."""
+        await self.redis.aclose()
+    
+    def _expire(self, pipe, session_id: str) -> None:
+        """Queue TTL refreshes for all of a session's keys."""
+        pipe.expire(_meta_key(session_id), self.ttl)
+        pipe.expire(_messages_key(session_id), self.ttl)
+        pipe.expire(_sources_key(session_id), self.ttl)
+        pipe.expire(_source_links_key(session_id), self.ttl)
+    
+    @staticmethod
+    def _to_session(session_id: str, meta: Dict[str, str], messages: List[str]) -> ChatSession:
+        """Build a ChatSession from its stored meta hash and message list."""
+        return ChatSession(
+            session_id=session_id,
+            title=meta.get("title") or DEFAULT_TITLE,
+            messages=[StoredMessage(**orjson.loads(message)) for message in messages],
+            created_at=meta["created_at"],
+            updated_at=meta["updated_at"],
+            updated_at_ts=float(meta.get("updated_at_ts") or 0)
+        )
+    
+    async def create_session(self, session_id: Optional[str] = None) -> str:
+        """Create a new chat session."""
+        return (await self.create_chat_session(session_id)).session_id
+    
+    async def create_chat_session(self, session_id: Optional[str] = None) -> ChatSession:
+        """Create a new chat session and return it rather than its ID."""
+        if not session_id:
+            session_id = uuid.uuid4().hex
+        
+        now = time.time()
+        now_iso = datetime.fromtimestamp(now).isoformat()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(_meta_key(session_id), _messages_key(session_id), _sources_key(session_id), _source_links_key(session_id))
+            pipe.hset(_meta_key(session_id), mapping={
+                "session_id": session_id,
+                "created_at": now_iso,
+                "updated_at": now_iso,
+                "updated_at_ts": now
+            })
+            pipe.zadd(SESSIONS_INDEX, {session_id: now})
+            pipe.set(CURRENT_SESSION, session_id)
+            self._expire(pipe, session_id)
+            await pipe.execute()
+        
+        return ChatSession(
+            session_id=session_id,
+            created_at=now_iso,
+            updated_at=now_iso,
+            updated_at_ts=now
+        )
+    
+    async def get_session(self, session_id: str) -> Optional[ChatSession]:
+        """Get a chat session by ID, None if it doesn't exist."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(_meta_key(session_id))
+            pipe.lrange(_messages_key(session_id), 0, -1)
+            meta, messages = await pipe.execute()
+        
+        if not meta:
+            return None
+        
+        return self._to_session(session_id, meta, messages)
+    
+    async def get_current_session(self) -> Optional[ChatSession]:
+        """Get the current chat session."""
+        session_id = await self.redis.get(CURRENT_SESSION)
+        if not session_id:
+            return None
+        
+        return await self.get_session(session_id)
+    
+    async def get_current_session_id(self) -> Optional[str]:
+        """Get the current session's ID without loading its messages."""
+        session_id = await self.redis.get(CURRENT_SESSION)
+        if not session_id or not await self.redis.exists(_meta_key(session_id)):
+            return None
+        return session_id
+    
+    async def add_message(self, session_id: str, message: Message) -> bool:
+        """Add a message to a chat session, creating the session if needed."""
+        return await self.add_messages(session_id, [message])
+    
+    async def add_messages(self, session_id: str, messages: List[Message]) -> bool:
+        """
+        Add several messages to a chat session in one transaction.
+        
+        All messages go out in a single variadic RPUSH, and the session
+        metadata is updated once for the whole batch.
+        
+        Args:
+            session_id: Session to add to; created if it doesn't exist
+            messages: Messages to append, in order
+            
+        Returns:
+            True once the messages are added
+        """
+        if not messages:
+            return True
+        
+        now = time.time()
+        now_iso = datetime.fromtimestamp(now).isoformat()
+        meta_key = _meta_key(session_id)
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # Create session if it doesn't exist
+            pipe.hsetnx(meta_key, "session_id", session_id)
+            pipe.hsetnx(meta_key, "created_at", now_iso)
+            first_user = next((message for message in messages if message.role == "user"), None)
+            if first_user:
+                # Only the first user message names the session
+                pipe.hsetnx(meta_key, "title", title_from(first_user.content))
+            pipe.hset(meta_key, mapping={"updated_at": now_iso, "updated_at_ts": now})
+            
+            pipe.rpush(_messages_key(session_id), *(orjson.dumps(message.model_dump(), default=str) for message in messages))
+            pipe.ltrim(_messages_key(session_id), -self.max_messages, -1)
+            
+            # First citation of a source wins, so repeats across turns are dropped.
+            # Scores keep first-cited order: milliseconds, then position in the batch.
+            order = int(now * 1000) * 1000
+            for message in messages:
+                if message.role == "assistant" and message.sources:
+                    for source in message.sources:
+                        key = source_key(source)
+                        if key:
+                            pipe.hsetnx(_sources_key(session_id), key, orjson.dumps(source, default=str))
+                            pipe.zadd(_source_links_key(session_id), {key: order}, nx=True)
+                            order += 1
+            
+            pipe.zadd(SESSIONS_INDEX, {session_id: now})
+            pipe.set(CURRENT_SESSION, session_id)
+            self._expire(pipe, session_id)
+            await pipe.execute()
+        
+        return True
+    
+    async def get_messages(self, session_id: str) -> List[StoredMessage]:
+        """Get all messages for a chat session."""
+        messages = await self.redis.lrange(_messages_key(session_id), 0, -1)
+        return [StoredMessage(**orjson.loads(message)) for message in messages]
+    
+    async def get_recent_messages(self, session_id: str, limit: int) -> List[StoredMessage]:
+        """Get up to ``limit`` of a chat session's most recent messages, oldest first."""
+        if limit <= 0:
+            return []
+        
+        messages = await self.redis.lrange(_messages_key(session_id), -limit, -1)
+        return [StoredMessage(**orjson.loads(message)) for message in messages]
+    
+    async def get_chat_history(self, session_id: str) -> List[Message]:
+        """Get all messages for a chat session as Message models."""
+        return [message.to_message() for message in await self.get_messages(session_id)]
+    
+    async def get_all_sessions(self) -> List[str]:
+        """Get all session IDs, most recently updated first."""
+        return await self.redis.zrevrange(SESSIONS_INDEX, 0, -1)
+    
+    async def get_session_title(self, session_id: str) -> str:
+        """Get the title for a chat session."""
+        return await self.redis.hget(_meta_key(session_id), "title") or DEFAULT_TITLE
+    
+    async def get_session_update_time(self, session_id: str) -> str:
+        """Get the update time for a chat session."""
+        return await self.redis.hget(_meta_key(session_id), "updated_at") or datetime.now().isoformat()
+    
+    async def clear_session(self, session_id: str) -> bool:
+        """Clear all messages from a chat session."""
+        if not await self.redis.exists(_meta_key(session_id)):
+            return False
+        
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(_messages_key(session_id), _sources_key(session_id), _source_links_key(session_id))
+            pipe.hdel(_meta_key(session_id), "title")
+            pipe.hset(_meta_key(session_id), mapping={
+                "updated_at": datetime.fromtimestamp(now).isoformat(),
+                "updated_at_ts": now
+            })
+            pipe.zadd(SESSIONS_INDEX, {session_id: now})
+            self._expire(pipe, session_id)
+            await pipe.execute()
+        
+        return True
+    
+    async def update_session_title(self, session_id: str, title: str) -> bool:
+        """Update the title of a chat session."""
+        if not await self.redis.exists(_meta_key(session_id)):
+            return False
+        
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_meta_key(session_id), mapping={
+                "title": title,
+                "updated_at": datetime.fromtimestamp(now).isoformat(),
+                "updated_at_ts": now
+            })
+            pipe.zadd(SESSIONS_INDEX, {session_id: now})
+            self._expire(pipe, session_id)
+            await pipe.execute()
+        
+        return True
+    
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete a chat session."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(_meta_key(session_id), _messages_key(session_id), _sources_key(session_id), _source_links_key(session_id))
+            pipe.zrem(SESSIONS_INDEX, session_id)
+            pipe.get(CURRENT_SESSION)
+            deleted, _, current = await pipe.execute()
+        
+        # Update current session if this was the current one
+        if current == session_id:
+            await self.redis.delete(CURRENT_SESSION)
+        
+        return deleted > 0
+    
+    async def get_sources(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the unique sources cited in a session.
+        
+        Args:
+            session_id: Optional session ID. If None, uses the current session.
+        
+        Returns:
+            List of source dictionaries, one per link (or title), in order of first citation
+        """
+        # Use current session if no session_id provided
+        if not session_id:
+            session_id = await self.redis.get(CURRENT_SESSION)
+            if not session_id:
+                return []
+        
+        links = await self.redis.zrange(_source_links_key(session_id), 0, -1)
+        if not links:
+            return []
+        
+        sources = await self.redis.hmget(_sources_key(session_id), links)
+        return [orjson.loads(source) for source in sources if source]
+    
+    async def list_sessions_page(self, offset: int = 0, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        List one page of chat sessions.
+        
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return. None returns the rest.
+        
+        Returns:
+            List of session summaries, most recently updated first
+        """
+        stop = -1 if limit is None else offset + limit - 1
+        session_ids = await self.redis.zrevrange(SESSIONS_INDEX, offset, stop)
+        if not session_ids:
+            return []
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(_meta_key(session_id))
+                pipe.lindex(_messages_key(session_id), -1)
+            results = await pipe.execute()
+        
+        sessions = []
+        expired = []
+        for session_id, meta, last in zip(session_ids, results[::2], results[1::2]):
+            if not meta:
+                # Session keys expired; drop it from the index too
+                expired.append(session_id)
+                continue
+            
+            sessions.append({
+                "session_id": session_id,
+                "title": meta.get("title") or DEFAULT_TITLE,
+                "last_message": orjson.loads(last)["content"] if last else "",
+                "created_at": meta["created_at"],
+                "updated_at": meta["updated_at"]
+            })
+        
+        if expired:
+            await self.redis.zrem(SESSIONS_INDEX, *expired)
+        
+        return sessions
+    
+    async def get_sessions_with_meta(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the ID, title and update time of one page of sessions in two round trips.
+        
+        Update times come from the index scores, so only titles are fetched
+        per session, all in one pipeline.
+        
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return. None returns the rest.
+            
+        Returns:
+            List of {"session_id", "title", "updated_at"} dicts, most recently updated first
+        """
+        stop = -1 if limit is None else offset + limit - 1
+        entries = await self.redis.zrevrange(SESSIONS_INDEX, offset, stop, withscores=True)
+        if not entries:
+            return []
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id, _ in entries:
+                pipe.hmget(_meta_key(session_id), "session_id", "title")
+            results = await pipe.execute()
+        
+        sessions = []
+        expired = []
+        for (session_id, score), (stored_id, title) in zip(entries, results):
+            if stored_id is None:
+                # Session keys expired; drop it from the index too
+                expired.append(session_id)
+                continue
+            
+            sessions.append({
+                "session_id": session_id,
+                "title": title or DEFAULT_TITLE,
+                "updated_at": datetime.fromtimestamp(score).isoformat()
+            })
+        
+        if expired:
+            await self.redis.zrem(SESSIONS_INDEX, *expired)
+        
+        return sessions
+    
+    async def list_sessions(self) -> List[Dict[str, Any]]:
+        """
+        List all chat sessions.
+        
+        Returns:
+            List of session summaries, most recently updated first
+        """
+        return await self.list_sessions_page(limit=None)
\ No newline at end of file
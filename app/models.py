@@ -1,49 +1,64 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Any
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple, Union, Any
+from pydantic import BaseModel, ConfigDict, Field
+
+# Every source type, searched when a query doesn't filter them
+DEFAULT_SOURCES = ("Web", "News", "Twitter", "Academic", "Reddit")
 
 
 class SourceReference(BaseModel):
     """Model representing a reference source"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     num: int
     title: str
     link: str
     source: str
     preview: Optional[str] = None
-    images: Optional[List[str]] = []
+    images: Optional[List[str]] = Field(default_factory=list)
     logo: Optional[str] = None
 
 
 class QueryFilters(BaseModel):
     """Filters for specifying which sources to use in a query"""
-    sources: Optional[List[str]] = Field(
-        default=["Web", "News", "Twitter", "Academic", "Reddit"],
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
+    sources: Optional[Tuple[str, ...]] = Field(
+        default=DEFAULT_SOURCES,
         description="Which sources to use in the search"
     )
 
 
 class QueryRequest(BaseModel):
     """Request model for processing queries"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     query: str
     filters: Optional[QueryFilters] = None
 
 
 class ChatMessage(BaseModel):
     """Individual chat message model"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     role: str = Field(..., description="Either 'user' or 'assistant'")
     content: str
-    sources: Optional[List[SourceReference]] = []
+    sources: Optional[List[SourceReference]] = Field(default_factory=list)
     timestamp: Optional[datetime] = Field(default_factory=datetime.now)
 
 
 class ChatRequest(BaseModel):
     """Request model for chat interactions"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     query: str
-    messages: Optional[List[ChatMessage]] = []
+    messages: Optional[List[ChatMessage]] = Field(default_factory=list)
 
 
 class ChatSummary(BaseModel):
     """Summary of a chat session"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     id: str
     title: str
     updatedAt: datetime
@@ -51,20 +66,28 @@ class ChatSummary(BaseModel):
 
 class ChatResponse(BaseModel):
     """Response model for chat listings"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     chats: List[ChatSummary]
 
 
 class SourceResponse(BaseModel):
     """Response model for source listings"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     sources: List[SourceReference]
 
 
 class QueryResult(BaseModel):
     """Result model for processed queries"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     content: str
     sources: List[SourceReference]
 
 
 class QueryResponse(BaseModel):
     """Response model for processed queries"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     response: QueryResult 
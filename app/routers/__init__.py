@@ -1,5 +0,0 @@
-"""
-Routers package for SourceFinder API.
-
-This package contains the API route definitions for the SourceFinder API.
-""" 
\ No newline at end of file
@@ -3,17 +3,29 @@ API routes for the SourceFinder application.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
-from app.services.source_finder import SourceFinder
-from app.schemas.chat import Message, QueryRequest, QueryResponse, ChatSession
-from app.memory.chat_memory import ChatMemory
+from app.services.source_finder import SourceFinder, MODEL_ID, PROMPT_HISTORY_MESSAGES
+from app.schemas.chat import Message, QueryRequest, QueryResponse, ResponseContent, ChatSession
+from app.memory import ChatStore
+from app.dependencies import get_chat_memory, get_source_finder, get_session_locks, get_source_verifier
+from app.locks import SessionLocks
+from app.verification import SourceVerifier, VerificationResult
+from app.cache import cached_response, invalidate_cache, query_cache_key, get_query_result, set_query_result
+import hashlib
+import logging
+import time
 import uuid
 from datetime import datetime
+import orjson
+
+logger = logging.getLogger("sourcefinder.routes")
 
 router = APIRouter()
-source_finder = SourceFinder()
-chat_memory = ChatMemory()
+
+# Source types accepted in filters["Sources"]
+ALLOWED_SOURCES = frozenset({"Reddit", "Twitter", "Web", "News", "Academic"})
 
 class SourcesRequest(BaseModel):
     session_id: str
@@ -28,183 +40,294 @@ class ChatsRequest(BaseModel):
 class ChatsResponse(BaseModel):
     chats: List[Dict[str, Any]]
 
+class CurrentSessionResponse(BaseModel):
+    session_id: Optional[str] = None
+    title: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    message: Optional[str] = None
+
+async def _resolve_session_id(chat_memory: ChatStore, request: QueryRequest) -> str:
+    """Use the given session, else the current one; only derive a new ID if neither exists."""
+    if request.session_id:
+        return request.session_id
+    
+    # Try to get current session instead of creating a new one
+    current_session_id = await chat_memory.get_current_session_id()
+    if current_session_id:
+        logger.info("Using existing session: %s", current_session_id)
+        return current_session_id
+    
+    # Only create a new session if no session exists at all. Derive its ID
+    # from the opening question so a retried first request lands in the same
+    # session rather than starting another; clients should send session_id.
+    session_id = hashlib.md5(request.query.strip().lower().encode()).hexdigest()
+    logger.info("Creating new session: %s", session_id)
+    return session_id
+
+def _source_filters(request: QueryRequest) -> Optional[List[str]]:
+    """Extract the known source types to search from the request's filters, if any."""
+    requested = request.filters.get("Sources") if request.filters else None
+    source_filters = [requested] if isinstance(requested, str) else (requested if isinstance(requested, list) else None)
+    if source_filters:
+        # Unknown source types are dropped; if none are left, search everything
+        source_filters = [source for source in source_filters if isinstance(source, str) and source in ALLOWED_SOURCES] or None
+    return source_filters
+
+async def _store_turn(chat_memory: ChatStore, session_id: str, query: str, response_text: str, sources: List[Dict[str, Any]]) -> None:
+    """Save a query and its answer to the session."""
+    # Create a new message record
+    now = datetime.now().isoformat()
+    user_message = Message(
+        role="user",
+        content=query,
+        timestamp=now
+    )
+    
+    assistant_message = Message(
+        role="assistant",
+        content=response_text,
+        sources=sources,  # Store the sources with the message
+        timestamp=now
+    )
+    
+    # Save messages to chat memory
+    await chat_memory.add_messages(session_id, [user_message, assistant_message])
+    await invalidate_cache()
+
+def _sse_chunk(completion_id: str, created: int, delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> str:
+    """Format one server-sent event in the shape of an OpenAI chat.completion.chunk."""
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": MODEL_ID,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        **extra
+    }
+    return f"data: {orjson.dumps(chunk, default=str).decode()}\n\n"
+
+async def _verify_answer(source_verifier: SourceVerifier, request: QueryRequest, response_text: str, sources: List[Dict[str, Any]]) -> Optional[VerificationResult]:
+    """Verify an answer against its sources; None if there is nothing to check or it fails."""
+    if not sources:
+        return None
+    try:
+        return await source_verifier.verify_information_async(response_text, sources, request.verification_method)
+    except Exception as verification_error:
+        # A failed check shouldn't cost the user the answer itself
+        logger.error("Error verifying answer: %s", verification_error)
+        return None
+
 @router.post("/api/process-query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
-    """Process a user query and return a response with sources."""
+async def process_query(
+    request: QueryRequest,
+    chat_memory: ChatStore = Depends(get_chat_memory),
+    source_finder: SourceFinder = Depends(get_source_finder),
+    session_locks: SessionLocks = Depends(get_session_locks),
+    source_verifier: SourceVerifier = Depends(get_source_verifier)
+):
+    """Process a user query and return a response with sources, verified if asked."""
     try:
-        # Get session info - use provided session_id or current session, only create new if neither exists
-        session_id = request.session_id
-        if not session_id:
-            # Try to get current session instead of creating a new one
-            current_session = chat_memory.get_current_session()
-            if current_session:
-                session_id = current_session.session_id
-                print(f"Using existing session: {session_id}")
-            else:
-                # Only create a new session if no session exists at all
-                session_id = str(uuid.uuid4())
-                print(f"Creating new session: {session_id}")
-        
-        # Get chat history for context if available
-        chat_history = chat_memory.get_messages(session_id)
+        session_id = await _resolve_session_id(chat_memory, request)
         
-        # Extract source filters if provided
-        source_filters = None
-        if request.filters and "Sources" in request.filters:
-            source_filters = request.filters["Sources"]
-            # Validate source filters
-            if isinstance(source_filters, list):
-                # Filter is already a list, which is what we want
-                pass
-            elif isinstance(source_filters, str):
-                # Convert single string to a list with one item
-                source_filters = [source_filters]
-            else:
-                # Invalid format, log warning and don't apply filtering
-                print(f"⚠️ Invalid Sources filter format: {type(source_filters)}")
-                source_filters = None
+        # Hold the session's lock while answering from its history and saving
+        # the turn, so the next query on the session sees it. Saving is cheap
+        # (an in-memory update with a queued log write, or one Redis round trip),
+        # so it stays inside the lock rather than in a background task that
+        # would run only after the lock is released
+        async with session_locks(session_id):
+            # Get recent chat history for context if available
+            chat_history = await chat_memory.get_recent_messages(session_id, limit=PROMPT_HISTORY_MESSAGES)
             
-            # Log the filters being applied
-            if source_filters:
-                print(f"🔍 Applying source filters: {source_filters}")
-        
-        try:
-            # Process the query with the source finder
-            response_text, sources = await source_finder.process_query(
-                request.query, 
-                chat_history=chat_history, 
-                filters=source_filters
-            )
+            source_filters = _source_filters(request)
+            
+            # Answers only depend on the query alone when there's no history to
+            # take into account, so only those are shared between sessions
+            cache_key = None if chat_history else query_cache_key(request.query, source_filters)
+            cached = await get_query_result(cache_key) if cache_key else None
+            
+            if cached:
+                logger.info("⚡ Using cached result for query: %s", request.query)
+                response_text, sources = cached["content"], cached["sources"]
+            else:
+                try:
+                    # Process the query with the source finder
+                    response_text, sources = await source_finder.process_query(
+                        request.query, 
+                        chat_history=chat_history, 
+                        filters=source_filters
+                    )
 
-            # Print debug info about sources
-            print(f"Debug sources count: {len(sources)}")
-            if sources:
-                print(f"Debug first source: {sources[0]}")
-        except Exception as source_error:
-            # Handle source finder errors gracefully
-            print(f"Error in source finder: {str(source_error)}")
-            response_text = "I apologize, but I encountered an error while processing your query. Please try again or contact support if the issue persists."
-            sources = []
-        
-        # Create a new message record
-        user_message = Message(
-            role="user",
-            content=request.query,
-            timestamp=datetime.now().isoformat()
-        )
-        
-        assistant_message = Message(
-            role="assistant",
-            content=response_text,
-            sources=sources,  # Store the sources with the message
-            timestamp=datetime.now().isoformat()
-        )
+                    # Print debug info about sources
+                    logger.debug("Sources count: %d", len(sources))
+                    if sources:
+                        logger.debug("First source: %s", sources[0])
+                    
+                    # Answers without sources are usually failures; don't keep them around
+                    if cache_key and sources:
+                        await set_query_result(cache_key, {"content": response_text, "sources": sources})
+                except Exception as source_error:
+                    # Handle source finder errors gracefully
+                    logger.error("Error in source finder: %s", source_error)
+                    response_text = "I apologize, but I encountered an error while processing your query. Please try again or contact support if the issue persists."
+                    sources = []
+            
+            await _store_turn(chat_memory, session_id, request.query, response_text, sources)
         
-        # Save messages to chat memory
-        chat_memory.add_message(session_id, user_message)
-        chat_memory.add_message(session_id, assistant_message)
+        # Verification only reads the answer and its sources, so it runs after
+        # the session's lock is released
+        verification = await _verify_answer(source_verifier, request, response_text, sources) if request.verify else None
         
-        # Return the response
-        return QueryResponse(
-            response={
-                "content": response_text,
-                "sources": sources
-            }
+        # Return the response (built by us, so skip validating the sources again)
+        return QueryResponse.model_construct(
+            response=ResponseContent.model_construct(content=response_text, sources=sources),
+            verification=verification
         )
     except Exception as e:
-        print(f"API error: {str(e)}")
+        logger.error("API error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+
+@router.post("/api/process-query/stream")
+async def process_query_stream(
+    request: QueryRequest,
+    chat_memory: ChatStore = Depends(get_chat_memory),
+    source_finder: SourceFinder = Depends(get_source_finder),
+    session_locks: SessionLocks = Depends(get_session_locks)
+):
+    """
+    Process a user query, streaming the response as server-sent events.
+    
+    Events follow OpenAI's chat.completion.chunk format: one per response
+    chunk, then a final one with finish_reason "stop" carrying the sources,
+    then ``data: [DONE]``. The exchange is saved before ``[DONE]`` is sent.
+    """
+    try:
+        session_id = await _resolve_session_id(chat_memory, request)
+    except Exception as e:
+        logger.error("API error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+    
+    source_filters = _source_filters(request)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    
+    async def event_stream():
+        response_text = ""
+        sources = []
+        yield _sse_chunk(completion_id, created, {"role": "assistant"}, session_id=session_id)
+        
+        # Hold the session's lock from reading its history until the turn is
+        # saved, like process_query, so queries on one session don't answer
+        # from the same stale history
+        async with session_locks(session_id):
+            chat_history = await chat_memory.get_recent_messages(session_id, limit=PROMPT_HISTORY_MESSAGES)
+            
+            async for event, value in source_finder.stream_query(request.query, chat_history=chat_history, filters=source_filters):
+                if event == "sources":
+                    sources = value
+                    continue
+                
+                if event == "error":
+                    # Errors replace whatever was generated so far
+                    response_text = value
+                else:
+                    response_text += value
+                yield _sse_chunk(completion_id, created, {"content": value})
+            
+            yield _sse_chunk(completion_id, created, {}, "stop", sources=sources)
+            await _store_turn(chat_memory, session_id, request.query, response_text, sources)
+        
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 @router.get("/api/sources", response_model=SourcesResponse)
-async def get_sources(session_id: Optional[str] = Query(None)):
+@cached_response(expire=60, namespace="sources")
+async def get_sources(
+    session_id: Optional[str] = Query(None),
+    chat_memory: ChatStore = Depends(get_chat_memory)
+):
     """Get all sources for the current chat session."""
     try:
         # Use current session if available and no session_id provided
         if not session_id:
             # Try to get the current session ID from chat_memory
-            current_session = chat_memory.get_current_session()
-            if current_session:
-                session_id = current_session.session_id
-            else:
+            session_id = await chat_memory.get_current_session_id()
+            if not session_id:
                 # Return empty sources if no session available
-                print("⚠️ No session ID provided and no current session available")
+                logger.warning("⚠️ No session ID provided and no current session available")
                 return SourcesResponse(sources=[])
             
-        # Get all messages for the session
-        messages = chat_memory.get_messages(session_id)
+        # Unique sources cited by the session's assistant messages
+        sources = await chat_memory.get_sources(session_id)
+        if not sources:
+            # Nothing cited yet (the common case for polls of a new chat)
+            return SourcesResponse.model_construct(sources=[])
         
-        # Extract all sources from assistant messages
+        # Filter out any invalid sources and ensure required fields
         all_sources = []
-        for message in messages:
-            if (message.role == "assistant" and 
-                hasattr(message, 'sources') and 
-                isinstance(message.sources, list) and 
-                message.sources):
-                # Filter out any invalid sources and ensure required fields
-                valid_sources = []
-                for source in message.sources:
-                    if isinstance(source, dict) and source.get('title') and source.get('link'):
-                        # Ensure all required fields are present with defaults if missing
-                        valid_source = {
-                            "title": source.get('title', ''),
-                            "link": source.get('link', ''),
-                            "source": source.get('source', 'Unknown'),
-                            "snippet": source.get('snippet', ''),
-                            "media": source.get('media', []),
-                            "logo": source.get('logo', ''),
-                            "num": source.get('num', len(valid_sources) + 1)
-                        }
-                        valid_sources.append(valid_source)
-                
-                all_sources.extend(valid_sources)
+        for source in sources:
+            if source.get('title') and source.get('link'):
+                # Ensure all required fields are present with defaults if missing
+                all_sources.append({
+                    "title": source.get('title', ''),
+                    "link": source.get('link', ''),
+                    "source": source.get('source', 'Unknown'),
+                    "snippet": source.get('snippet', ''),
+                    "media": source.get('media', []),
+                    "logo": source.get('logo', ''),
+                    "num": source.get('num', len(all_sources) + 1)
+                })
         
-        print(f"✅ Found {len(all_sources)} valid sources for session {session_id}")
+        logger.info("✅ Found %d valid sources for session %s", len(all_sources), session_id)
         
         # Add debug output
         if len(all_sources) == 0:
-            print("⚠️ No valid sources found in session messages")
-            print(f"Message count: {len(messages)}")
-            for i, msg in enumerate(messages):
-                has_sources = hasattr(msg, 'sources') and msg.sources
-                print(f"Message {i} role: {msg.role}, has sources: {has_sources}")
-                if has_sources:
-                    print(f"Sources count: {len(msg.sources)}")
+            logger.debug("⚠️ No valid sources found in session messages")
+            logger.debug("Indexed source count: %d", len(sources))
         
-        return SourcesResponse(sources=all_sources)
+        return SourcesResponse.model_construct(sources=all_sources)
     except Exception as e:
-        print(f"❌ Error retrieving sources: {str(e)}")
+        logger.error("❌ Error retrieving sources: %s", e)
         raise HTTPException(status_code=500, detail=f"Error retrieving sources: {str(e)}")
 
 @router.post("/api/chats", response_model=ChatsResponse)
-async def create_chat(request: ChatsRequest, refresh: bool = Query(False)):
+async def create_chat(
+    request: ChatsRequest,
+    refresh: bool = Query(False),
+    chat_memory: ChatStore = Depends(get_chat_memory),
+    source_finder: SourceFinder = Depends(get_source_finder)
+):
     """Create a new chat or add to an existing chat."""
     try:
         # Generate a new session ID only if refresh is True or no current session exists
         if refresh:
             # Force creation of a new session
-            session_id = str(uuid.uuid4())
-            print(f"Creating new session (refresh requested): {session_id}")
+            session_id = uuid.uuid4().hex
+            logger.info("Creating new session (refresh requested): %s", session_id)
         else:
             # Check if there's a current session
-            current_session = chat_memory.get_current_session()
-            if current_session:
+            session_id = await chat_memory.get_current_session_id()
+            if session_id:
                 # Use existing session
-                session_id = current_session.session_id
-                print(f"Using existing session: {session_id}")
+                logger.info("Using existing session: %s", session_id)
             else:
                 # Create new session only if none exists
-                session_id = str(uuid.uuid4())
-                print(f"Creating new session (none exists): {session_id}")
+                session_id = uuid.uuid4().hex
+                logger.info("Creating new session (none exists): %s", session_id)
+        
+        # Collect everything to store so it's written in one batch
+        new_messages: List[Message] = []
         
         # If we have a query and messages, create a new chat
         if request.query:
             # Create user message
+            now = datetime.now().isoformat()
             user_message = Message(
                 role="user",
                 content=request.query,
-                timestamp=datetime.now().isoformat()
+                timestamp=now
             )
-            chat_memory.add_message(session_id, user_message)
+            new_messages.append(user_message)
             
             # Process with source finder
             try:
@@ -218,58 +341,73 @@ async def create_chat(request: ChatsRequest, refresh: bool = Query(False)):
                     role="assistant",
                     content=response_text,
                     sources=sources,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=now
                 )
-                chat_memory.add_message(session_id, assistant_message)
+                new_messages.append(assistant_message)
             except Exception as e:
-                print(f"Error processing query: {str(e)}")
+                logger.error("Error processing query: %s", e)
                 # Still create the chat even if processing failed
                 pass
         
-        # If we have messages, add them to the chat
-        if request.messages:
+        elif request.messages:
+            # No query: the messages are the chat itself. With a query they are
+            # only context for the source finder and are not stored again.
+            # Skip ones already stored (or repeated) so retries don't duplicate them.
+            seen = {
+                (message.role, message.content, message.timestamp)
+                for message in await chat_memory.get_messages(session_id)
+            }
             for message in request.messages:
-                chat_memory.add_message(session_id, message)
+                key = (message.role, message.content, message.timestamp)
+                if key not in seen:
+                    seen.add(key)
+                    new_messages.append(message)
+        
+        await chat_memory.add_messages(session_id, new_messages)
+        
+        await invalidate_cache()
         
         # Return list of all chats
-        return await list_chats()
+        return await _chats_response(chat_memory)
     except Exception as e:
-        print(f"Error creating chat: {str(e)}")
+        logger.error("Error creating chat: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating chat: {str(e)}")
 
+async def _chats_response(chat_memory: ChatStore, offset: int = 0, limit: Optional[int] = None) -> ChatsResponse:
+    """Build the chat listing for one page of sessions, most recent first."""
+    chats = [
+        {"title": session["title"], "updatedAt": session["updated_at"]}
+        for session in await chat_memory.get_sessions_with_meta(offset, limit)
+    ]
+    return ChatsResponse.model_construct(chats=chats)
+
 @router.get("/api/chats", response_model=ChatsResponse)
-async def list_chats():
-    """List all chat sessions."""
+@cached_response(expire=30, namespace="chats")
+async def list_chats(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    chat_memory: ChatStore = Depends(get_chat_memory)
+):
+    """List chat sessions, optionally one page at a time."""
     try:
-        # Get all chat sessions
-        sessions = chat_memory.get_all_sessions()
-        
-        # Format the response
-        chats = []
-        for session_id in sessions:
-            chats.append({
-                "title": chat_memory.get_session_title(session_id),
-                "updatedAt": chat_memory.get_session_update_time(session_id)
-            })
-        
-        return ChatsResponse(chats=chats)
+        return await _chats_response(chat_memory, offset, limit)
     except Exception as e:
-        print(f"Error listing chats: {str(e)}")
+        logger.error("Error listing chats: %s", e)
         raise HTTPException(status_code=500, detail=f"Error listing chats: {str(e)}")
 
-@router.get("/api/current-session")
-async def get_current_session():
+@router.get("/api/current-session", response_model=CurrentSessionResponse, response_model_exclude_unset=True)
+async def get_current_session(chat_memory: ChatStore = Depends(get_chat_memory)):
     """Get the current session ID."""
     try:
-        current_session = chat_memory.get_current_session()
+        current_session = await chat_memory.get_current_session()
         if current_session:
-            return {
-                "session_id": current_session.session_id,
-                "title": chat_memory.get_session_title(current_session.session_id),
-                "updated_at": current_session.updated_at
-            }
+            return CurrentSessionResponse(
+                session_id=current_session.session_id,
+                title=await chat_memory.get_session_title(current_session.session_id),
+                updated_at=current_session.updated_at
+            )
         else:
-            return {"session_id": None, "message": "No active session"}
+            return CurrentSessionResponse(session_id=None, message="No active session")
     except Exception as e:
-        print(f"❌ Error getting current session: {str(e)}")
+        logger.error("❌ Error getting current session: %s", e)
         raise HTTPException(status_code=500, detail=f"Error getting current session: {str(e)}") 
\ No newline at end of file
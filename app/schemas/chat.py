@@ -1,17 +1,57 @@
 """
 Pydantic models for chat data.
 """
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator
+from typing import List, Dict, Optional, Any, Deque, Final
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
+import time
+
+from app.config.settings import settings
+from app.verification import VerificationMethod, VerificationResult
+
+# Title of a session until its first user message names it
+DEFAULT_TITLE: Final[str] = "New Chat"
 
 class Message(BaseModel):
     """Chat message model."""
+    # Built in-process, so trust existing instances instead of revalidating them
+    model_config = ConfigDict(revalidate_instances="never")
+    
     role: str  # "user" or "assistant"
     content: str
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
     sources: Optional[List[Dict[str, Any]]] = None
 
+@dataclass(slots=True)
+class StoredMessage:
+    """
+    Compact in-memory form of a Message.
+    
+    Sessions can hold thousands of messages, so they are kept as slotted
+    dataclasses without pydantic's per-instance bookkeeping and converted
+    back to Message at the API boundary.
+    """
+    role: str
+    content: str
+    timestamp: str
+    sources: Optional[List[Dict[str, Any]]] = None
+    
+    @classmethod
+    def from_message(cls, message: Message) -> "StoredMessage":
+        """Create the stored form of a validated Message."""
+        return cls(message.role, message.content, message.timestamp, message.sources)
+    
+    def to_message(self) -> Message:
+        """Convert back to a Message (already validated, so construct directly)."""
+        return Message.model_construct(
+            role=self.role,
+            content=self.content,
+            timestamp=self.timestamp,
+            sources=self.sources
+        )
+
 class Source(BaseModel):
     """Source reference model."""
     title: str
@@ -29,6 +69,11 @@ class QueryRequest(BaseModel):
         None, 
         description="Filter settings for sources. Use 'Sources' key with a list of source types to include (e.g., 'Reddit', 'Twitter', 'Web', 'News', 'Academic')"
     )
+    verify: bool = Field(False, description="Whether to verify the answer against its sources")
+    verification_method: VerificationMethod = Field(
+        "stimulated_verification", 
+        description="The verification method to use when verify is set"
+    )
 
 class ResponseContent(BaseModel):
     """Response content model."""
@@ -38,6 +83,7 @@ class ResponseContent(BaseModel):
 class QueryResponse(BaseModel):
     """Response model for process-query endpoint."""
     response: ResponseContent
+    verification: Optional[VerificationResult] = None
 
 class ChatSummary(BaseModel):
     """Summary of a chat session."""
@@ -50,10 +96,28 @@ class ChatListResponse(BaseModel):
 
 class ChatSession(BaseModel):
     """Chat session model."""
+    model_config = ConfigDict(revalidate_instances="never")
+    
     session_id: str
-    messages: List[Message] = []
-    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    title: str = DEFAULT_TITLE
+    messages: Deque[StoredMessage] = Field(default_factory=deque, validate_default=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    updated_at_ts: float = Field(default_factory=time.time)  # Epoch form of updated_at, used for ordering
+    
+    # Unique sources cited by assistant messages, keyed by link (not serialized)
+    _sources_index: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+    
+    @field_validator("messages", mode="after")
+    @classmethod
+    def _bound_messages(cls, messages: Deque[StoredMessage]) -> Deque[StoredMessage]:
+        """Cap the history so the oldest messages drop off as new ones arrive."""
+        return deque(messages, maxlen=settings.MAX_MESSAGES_PER_SESSION)
+    
+    @field_serializer("created_at", "updated_at")
+    def _serialize_timestamp(self, value: datetime) -> str:
+        """Emit timestamps as ISO 8601 strings, as stored in the session logs."""
+        return value.isoformat()
 
 class ChatRequest(BaseModel):
     """Request model for creating or updating a chat."""
@@ -3,31 +3,141 @@ SourceFinder module for finding and verifying information from multiple sources.
 """
 
 import os
+import sys
+import logging
 import re
 import time
-import json
+import orjson
+import hashlib
+import importlib.util
 import arxiv
 import asyncio
 import aiohttp
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime, timedelta
+from weakref import WeakValueDictionary
 from urllib.parse import urlparse, urljoin
 from typing import Dict, Any, List, AsyncGenerator, Tuple, Optional
 from bs4 import BeautifulSoup
+from pydantic import BaseModel
 from google import genai
 from google.genai.types import GenerateContentConfig, Tool, HarmCategory, HarmBlockThreshold, SafetySetting
 import tweepy
 import asyncpraw
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
-from langchain.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 
+from app.cache import (
+    EXPANDED_QUERY_PREFIX,
+    PAGE_CACHE_PREFIX,
+    get_cached_value,
+    hashed_key,
+    set_cached_value
+)
+from app.services.ttl_cache import TTLCache, ttl_cached
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger("sourcefinder.source_finder")
+
 # Configuration
 MODEL_ID = "models/gemini-2.0-flash"
+# lxml's C parser is far faster than the pure-Python html.parser; fall back if it's missing
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+MAX_CONCURRENT_REQUESTS = 16
+HTTP_LIMIT_PER_HOST = 8
+# Concurrent requests allowed per upstream host; metered APIs get fewer to stay under their quotas
+HOST_REQUEST_LIMITS = {"serpapi.com": 2, "newsapi.org": 2}
+DEFAULT_HOST_REQUEST_LIMIT = 4
+SOURCE_DIVIDER = "-" * 50
+# Filter name -> platform key in the _read_query output
+FILTER_PLATFORMS = {
+    "Reddit": "Reddit",
+    "Twitter": "Twitter",
+    "Web": "Searpi",
+    "News": "NewsAPI",
+    "Academic": "Arxiv"
+}
+# Source type on a reference -> filter name it falls under
+SOURCE_TYPE_FILTERS = {
+    "SERP": "Web",
+    "Web": "Web",
+    "Knowledge Graph": "Web",
+    "NewsAPI": "News",
+    "News": "News",
+    "Twitter": "Twitter",
+    "Arxiv": "Academic",
+    "Academic": "Academic",
+    "Reddit": "Reddit",
+    "Direct URL": "Web"
+}
+REDDIT_URL = "https://reddit.com"
+TYPING_ANIMATION = sys.stdout.isatty() and not os.getenv("NO_TYPING_ANIM")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+PROMPT_HISTORY_MESSAGES = 10  # Most recent chat messages given to the model as context; routes fetch exactly this many
+HISTORY_SPEAKERS = {"user": "User", "assistant": "Assistant"}
+HISTORY_MODEL_ROLES = {"user": "user", "assistant": "model"}  # Chat role -> Gemini content role
+SOURCE_SEARCH_DEADLINE = 10  # Seconds to wait for all platforms before answering with those that finished
+SEARCH_DEADLINE_MARGIN = 0.5  # Searches give up this many seconds before the deadline, so they log it themselves
+SEARCH_RETRIES = 2  # Retries after a failed search, while the deadline allows
+SOURCE_PLATFORMS = ("Web", "News", "Twitter", "Academic", "Reddit", "URLs")  # get_all_sources key order
+ANSWER_INSTRUCTION = "You are a helpful AI assistant that provides accurate information and cites sources."
+ANALYSIS_INSTRUCTION = """**Research Analysis Protocol**
+1. Cross-reference all sources for consensus/conflicts
+2. Validate media against source context
+3. Highlight statistical significance
+4. Note temporal relevance
+5. Rate source credibility
+6. Maintain neutral academic tone
+7. Analyze all provided sources thoroughly
+8. Structure response with these sections:
+- 📌 Executive Summary (3-5 bullet points)
+- 🔍 Key Findings (numbered list with citations [1][2])
+- ⚖️ Controversies/Debates
+- ❓ Unanswered Questions
+- 📚 Recommended Further Research
+9. Use markdown formatting with **bold** and italics
+10. Always cite sources using [number] notation
+11. Highlight statistics with ✅
+12. Mention conflicting viewpoints with ⚠️
+13. Reference previous conversation context if provided
+This is solely majored for researchers. Create a follow up questions to help them better explore their question.
+Make it very detailed include points that i might have not specified. make sure it aligns t ath that will help the researcher in their research 
+Don't include anything related to this at the beginning of your answer: "Based on the provided sources"
+Include any other points that might help the users based on their specific requests/question in other to help the researcher explore amd get the right materials for their research 
+"""
+# Filled in per request with str.format_map
+ANALYSIS_PROMPT = """**Research Request**
+Query: {query}
+
+{conversation_context}
+**Aggregated Sources**
+{formatted_sources}
+
+**Media Analysis Context**
+{media_analysis}
+
+**Analysis Guidelines**
+- Verify image/video timestamps against claims
+- Check for source domain reputation
+- Compare academic vs social media perspectives
+- Highlight significant statistical outliers"""
+QUERY_CACHE_SIZE = 1000
+QUERY_CACHE_TTL = 24 * 3600  # Seconds an expanded query is reused
+PAGE_CACHE_TTL = 3600  # Seconds a fetched page is reused
+SEARCH_CACHE_TTL = 300  # Seconds a platform's results for a query are reused
+TWITTER_CACHE_TTL = 900  # Longer, to match Twitter's 15-minute rate limit window
+# Patterns used on every query, compiled once
+_URL_RE = re.compile(r'https?://\S+')
+_ABSOLUTE_HREF_RE = re.compile(r'^https?://')
+# Image URLs, inline data images and src attributes, replaced in a single pass
+_IMAGE_RE = re.compile(
+    r'(https?://\S+?\.(?:jpg|jpeg|png|gif|webp|svg))'
+    r'|(data:image/[a-z]+;base64,[a-zA-Z0-9+/=]+)'
+    r'|(src=[\'\"]https?://\S+?\.(?:jpg|jpeg|png|gif|webp|svg)[\'\"])',
+    re.IGNORECASE
+)
 SAFETY_SETTINGS = [
     SafetySetting(
         category=HarmCategory.HARM_CATEGORY_HARASSMENT,
@@ -47,6 +157,53 @@ SAFETY_SETTINGS = [
     ),
 ]
 
+class PlatformQueries(BaseModel):
+    """Response schema for the platform-specific queries _read_query asks the model for."""
+    Reddit: str
+    Twitter: str
+    Searpi: str
+    NewsAPI: str
+    Arxiv: str
+
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """Get a URL's netloc (host), caching the parse since the same URLs recur."""
+    return urlparse(url).netloc
+
+def _format_news_date(pub_date: str) -> str:
+    """
+    Format a NewsAPI ``publishedAt`` timestamp as e.g. "Mar 05, 2024".
+    
+    NewsAPI always sends UTC ISO-8601 (``YYYY-MM-DDTHH:MM:SSZ``), so the date
+    is sliced out directly instead of parsed; anything else is returned as is.
+    """
+    year, month, day = pub_date[:4], pub_date[5:7], pub_date[8:10]
+    if not (year.isdigit() and month.isdigit() and day.isdigit() and 1 <= int(month) <= 12):
+        return pub_date
+    return f"{_MONTHS[int(month) - 1]} {day}, {year}"
+
+def _short(text: str, limit: int) -> str:
+    """Truncate text to at most ``limit`` characters, at a word boundary when one is close to the end."""
+    if len(text) <= limit:
+        return text
+    text = text[:limit]
+    cut = text.rfind(' ')
+    return text[:cut] if cut > max(limit - 20, limit // 2) else text
+
+def _history_message(msg: Any) -> Tuple[Optional[str], Optional[str]]:
+    """Get a chat message's (role, content); stored messages are dicts, request messages are models."""
+    if isinstance(msg, dict):
+        return msg.get("role"), msg.get("content")
+    return getattr(msg, "role", None), getattr(msg, "content", None)
+
+def _norm_media(item: Any) -> str:
+    """Get the URL of a media entry, which may be a plain URL or a {"url": ...} dict."""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        return item.get('url', '')
+    return ''
+
 class SourceFinder:
     """Service for processing queries and finding relevant sources."""
     
@@ -54,70 +211,23 @@ class SourceFinder:
         """Initialize the source finder with necessary components."""
         self.genai_client = None
         self.genai_configured = False
-        self.source_references = []
-        self.search_times = {}
         self.session = None  # Persistent aiohttp session
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)  # Bounds in-flight HTTP requests
+        self._host_sems: "WeakValueDictionary[str, asyncio.Semaphore]" = WeakValueDictionary()  # See _sem_for
+        self._query_cache = TTLCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)  # Expanded platform queries
+        self._inflight: Dict[str, asyncio.Future] = {}  # URL fetches in progress, see _load_url_content
         
-        # Initialize conversation memory
-        self.memory = ConversationBufferMemory(
-            return_messages=True,
-            memory_key="chat_history"
-        )
-        
-        # Define the prompt template
-        template = """You are a helpful AI assistant that provides accurate information and cites sources.
-        
-        Current conversation:
-        {chat_history}
-        
-        Human: {input}
-        Assistant: Let me help you with that. I'll provide information and cite relevant sources.
-        
-        Response:"""
-        
-        prompt = PromptTemplate(
-            input_variables=["chat_history", "input"],
-            template=template
-        )
-        
-        # Initialize the conversation chain
+        # Configure Google Gen AI for direct API calls
         api_key = os.getenv("GOOGLE_AI_API_KEY")
         if api_key:
             try:
-                # Use the proper LangChain integration for Google Generative AI
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-2.0-flash", #"gemini-1.5-pro",
-                    google_api_key=api_key,
-                    temperature=0.2,
-                    convert_system_message_to_human=True
-                )
-                
-                # Fix the chain creation using the correct pattern
-                from langchain.chains.conversation.base import ConversationChain
-                
-                self.chain = ConversationChain(
-                    llm=llm,
-                    memory=self.memory,
-                    prompt=prompt,
-                    verbose=True
-                )
-                
+                self.genai_client = genai.Client(api_key=api_key)
                 self.genai_configured = True
-                print("✅ LangChain with GenAI configured successfully")
+                logger.info("✅ GenAI API configured successfully")
             except Exception as e:
-                print(f"❌ Error configuring LangChain with Gen AI: {e}")
-                self.genai_configured = False
+                logger.error("❌ Error configuring Gen AI: %s", e)
         else:
-            print("❌ GOOGLE_AI_API_KEY missing")
-            self.genai_configured = False
-        
-        # Configure Google Gen AI for direct API calls
-        if api_key:
-            try:
-                self.genai_client = genai.Client(api_key=api_key)
-                print("✅ GenAI API configured successfully")
-            except Exception as e:
-                print(f"❌ Error configuring Gen AI: {e}")
+            logger.warning("❌ GOOGLE_AI_API_KEY missing")
         
         # Initialize APIs
         self._init_twitter()
@@ -129,12 +239,12 @@ class SourceFinder:
         if bearer_token:
             try:
                 self.twitter = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=False)
-                print("✅ Twitter API configured successfully")
+                logger.info("✅ Twitter API configured successfully")
             except Exception as e:
-                print(f"❌ Twitter error: {e}")
+                logger.error("❌ Twitter error: %s", e)
                 self.twitter = None
         else:
-            print("❌ TWITTER_BEARER_TOKEN missing")
+            logger.warning("❌ TWITTER_BEARER_TOKEN missing")
             self.twitter = None
     
     def _init_reddit(self):
@@ -150,19 +260,34 @@ class SourceFinder:
                     client_secret=client_secret,
                     user_agent=user_agent
                 )
-                print("✅ Reddit API configured successfully")
+                logger.info("✅ Reddit API configured successfully")
             except Exception as e:
-                print(f"❌ Reddit error: {e}")
+                logger.error("❌ Reddit error: %s", e)
                 self.reddit = None
         else:
-            print("❌ Reddit credentials missing")
+            logger.warning("❌ Reddit credentials missing")
             self.reddit = None
     
+    @classmethod
+    async def create(cls) -> "SourceFinder":
+        """Create a source finder with its HTTP session already open."""
+        source_finder = cls()
+        await source_finder.create_session()
+        return source_finder
+    
     async def create_session(self):
         """Create persistent aiohttp session"""
         if not self.session or self.session.closed:
             self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=HTTP_LIMIT_PER_HOST,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,  # Keep idle connections to the search APIs warm between requests
+                    enable_cleanup_closed=True
+                ),
                 timeout=aiohttp.ClientTimeout(total=30),
+                json_serialize=lambda obj: orjson.dumps(obj).decode(),  # For any json= request bodies
                 headers={"User-Agent": "SourceFinder/1.0"}
             )
         return self.session
@@ -173,6 +298,25 @@ class SourceFinder:
             await self.session.close()
             self.session = None
     
+    def _sem_for(self, host: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent requests to one host.
+        
+        Semaphores are only held weakly, so a host's goes away once no
+        request to it is in flight.
+        
+        Args:
+            host: Host (netloc) being requested
+        
+        Returns:
+            The host's semaphore; callers keep it alive by holding it
+        """
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(HOST_REQUEST_LIMITS.get(host, DEFAULT_HOST_REQUEST_LIMIT))
+            self._host_sems[host] = sem
+        return sem
+    
     async def get_sources(self, query: str, source_filters: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Get sources for a query from multiple platforms.
@@ -197,17 +341,17 @@ class SourceFinder:
             
             return sources
         except Exception as e:
-            print(f"Error getting sources: {str(e)}")
+            logger.error("Error getting sources: %s", e)
             return {}
     
-    async def generate_answer(self, query: str, sources: Dict[str, List[Dict[str, Any]]], chat_history: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    async def generate_answer(self, query: str, sources: Dict[str, List[Dict[str, Any]]], chat_history: Optional[List[Any]] = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Generate an answer based on sources and chat history.
         
         Args:
             query: The user's query string
             sources: Dictionary of sources by platform
-            chat_history: Optional chat history for context
+            chat_history: Optional messages of this conversation, oldest first
             
         Returns:
             Tuple containing:
@@ -215,16 +359,28 @@ class SourceFinder:
             - references: List of source references
         """
         try:
-            # Format sources for the LLM
-            formatted_sources = await self._format_sources(sources)
-            
             # Generate response
             response = ""
             references = []
             
             if self.genai_configured:
-                # Use the conversation chain for response generation
-                response = self.chain.predict(input=query)
+                # One direct model call with this conversation's recent turns as context
+                contents = []
+                for msg in (chat_history or [])[-PROMPT_HISTORY_MESSAGES:]:
+                    role, content = _history_message(msg)
+                    if role in HISTORY_MODEL_ROLES and content:
+                        contents.append({"role": HISTORY_MODEL_ROLES[role], "parts": [{"text": content}]})
+                contents.append({"role": "user", "parts": [{"text": query}]})
+                result = await self.genai_client.aio.models.generate_content(
+                    model=MODEL_ID,
+                    config=GenerateContentConfig(
+                        temperature=0.2,
+                        safety_settings=SAFETY_SETTINGS,
+                        system_instruction=ANSWER_INSTRUCTION
+                    ),
+                    contents=contents
+                )
+                response = result.text or ""
                 
                 # Extract references from the response
                 references = self._extract_references(response, sources)
@@ -233,7 +389,7 @@ class SourceFinder:
             
             return response, references
         except Exception as e:
-            print(f"Error generating answer: {str(e)}")
+            logger.error("Error generating answer: %s", e)
             return "I apologize, but I encountered an error generating an answer.", []
     
     def _extract_references(self, response: str, sources: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -249,8 +405,8 @@ class SourceFinder:
         """
         references = []
         
-        # Extract URLs from the response
-        urls = re.findall(r'https?://\S+', response)
+        # Extract URLs from the response (as a set, so each source is matched in O(1))
+        urls = set(_URL_RE.findall(response))
         
         # Find matching sources
         for platform, platform_sources in sources.items():
@@ -289,21 +445,37 @@ class SourceFinder:
             }
 
         # Extract URLs from query for direct inspection
-        urls = re.findall(r'https?://\S+', query)
+        urls = _URL_RE.findall(query)
         text_parts = [query]
 
-        # Load summary content from URLs to enhance query context
-        for url in urls[:3]:  # Limit to first 3 URLs to avoid overloading
-            try:
-                content = await asyncio.wait_for(self._load_url_content(url), timeout=20)
-                if content.get('content') and not content.get('error'):
-                    # Add a shortened version of the content
-                    summary = content['content'][:1500]
-                    text_parts.append(f"URL CONTENT SUMMARY ({url}):\n{summary}")
-            except asyncio.TimeoutError:
+        # Load summary content from URLs to enhance query context, fetching them concurrently
+        urls = urls[:3]  # Limit to first 3 URLs to avoid overloading
+        contents = await asyncio.gather(
+            *[asyncio.wait_for(self._load_url_content(url), timeout=20) for url in urls],
+            return_exceptions=True
+        )
+        for url, content in zip(urls, contents):
+            if isinstance(content, BaseException):
                 continue
+            if content.get('content') and not content.get('error'):
+                # Add a shortened version of the content
+                summary = _short(content['content'], 1500)
+                text_parts.append(f"URL CONTENT SUMMARY ({url}):\n{summary}")
 
         combined_query = "\n".join(text_parts)
+        
+        # Identical requests (up to case and spacing) expand to the same queries
+        normalized = " ".join(combined_query.lower().split())
+        cache_key = hashlib.sha256(f"{MODEL_ID}:{normalized}".encode()).hexdigest()
+        cached = self._query_cache.get(cache_key)
+        if cached is None:
+            # Another worker (or an earlier run) may have expanded it already
+            cached = await get_cached_value(f"{EXPANDED_QUERY_PREFIX}:{cache_key}")
+            if cached is not None:
+                self._query_cache.set(cache_key, cached)
+        if cached is not None:
+            logger.info("⚡ Using cached platform-specific queries")
+            return dict(cached)
 
         system_instruction = """
         Convert this text into focused, specific search queries for different platforms.
@@ -324,26 +496,29 @@ class SourceFinder:
         """
 
         try:
-            response = self.genai_client.models.generate_content(
+            response = await self.genai_client.aio.models.generate_content(
                 model=MODEL_ID,
                 config=GenerateContentConfig(
                     temperature=0,
                     safety_settings=SAFETY_SETTINGS,
                     system_instruction=system_instruction,
-                    tools=[Tool(google_search={})]
+                    # Structured output makes the reply strictly parseable JSON
+                    response_mime_type="application/json",
+                    response_schema=PlatformQueries
                 ),
                 contents=[{"role": "user", "parts": [{"text": combined_query}]}]
             )
             
-            # Extract and parse JSON from response with robust error handling
+            # Parse the JSON response with robust error handling
             try:
-                json_str = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_str:
-                    query_dict = json.loads(json_str.group())
-                    print("✅ Generated platform-specific queries successfully")
-                    return query_dict
-            except (json.JSONDecodeError, AttributeError) as e:
-                print(f"❌ Error parsing query JSON: {str(e)}")
+                query_dict = orjson.loads(response.text or "")
+                if isinstance(query_dict, dict):
+                    logger.info("✅ Generated platform-specific queries successfully")
+                    self._query_cache.set(cache_key, query_dict)
+                    await set_cached_value(f"{EXPANDED_QUERY_PREFIX}:{cache_key}", query_dict, QUERY_CACHE_TTL)
+                    return dict(query_dict)
+            except (orjson.JSONDecodeError, AttributeError) as e:
+                logger.warning("❌ Error parsing query JSON: %s", e)
                 
             # Fallback to basic query if parsing fails
             return {
@@ -355,7 +530,7 @@ class SourceFinder:
             }
             
         except Exception as e:
-            print(f"❌ Query generation error: {str(e)}")
+            logger.error("❌ Query generation error: %s", e)
             return {
                 "Reddit": query,
                 "Twitter": query,
@@ -365,6 +540,24 @@ class SourceFinder:
             }
     
     async def _load_url_content(self, url: str) -> Dict[str, Any]:
+        """
+        Load content from a URL, sharing one fetch between concurrent callers.
+        
+        Args:
+            url: The URL to load
+            
+        Returns:
+            Dictionary containing the loaded content (shared, so don't modify it)
+        """
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_url_content(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # Shielded so one caller timing out doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_url_content(self, url: str) -> Dict[str, Any]:
         """
         Load content from a URL.
         
@@ -389,11 +582,12 @@ class SourceFinder:
 
         try:
             # Extract domain for logging
-            domain = urlparse(url).netloc
-            print(f"📄 Loading content from {domain}...")
+            domain = _netloc(url)
+            logger.debug("📄 Loading content from %s...", domain)
             
             # Create session if needed
             session = await self.create_session()
+            page_key = None
             
             # Load content based on URL type
             if url.endswith(".pdf"):
@@ -407,43 +601,70 @@ class SourceFinder:
                 result["title"] = f"Image from {domain}"
                 result["content"] = f"Image from {domain}"
             else:
-                # Handle web pages
-                async with session.get(url, timeout=15) as response:
-                    if response.status != 200:
-                        result["error"] = f"HTTP {response.status}"
-                        return result
-                    
-                    # Parse HTML
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Extract title
-                    title_tag = soup.find('title')
-                    result["title"] = title_tag.text if title_tag else f"Content from {domain}"
-                    
-                    # Extract content
-                    main_content = soup.find('main') or soup.find('article') or soup.find('body')
-                    if main_content:
-                        result["content"] = main_content.get_text(separator='\n', strip=True)[:10000]
-                    else:
-                        result["content"] = soup.get_text(separator='\n', strip=True)[:10000]
+                # Handle web pages, reusing a recent fetch of the same URL
+                page_key = hashed_key(PAGE_CACHE_PREFIX, url)
+                cached = await get_cached_value(page_key)
+                if cached is not None:
+                    return cached
+                
+                async with self._sem_for(domain), self._sem:
+                    async with session.get(url, timeout=15) as response:
+                        if response.status != 200:
+                            result["error"] = f"HTTP {response.status}"
+                            return result
+                        
+                        html = await response.text()
                     
-                    # Extract images
-                    for img in soup.find_all('img')[:5]:
-                        src = img.get('src')
-                        if src and not src.startswith('data:'):
-                            absolute_url = urljoin(url, src)
-                            result["media"].append(absolute_url)
+                # Parsing is CPU-bound, so keep it off the event loop
+                title, content, media, citations = await asyncio.to_thread(self._parse_html_sync, html, url)
+                result["title"] = title if title is not None else f"Content from {domain}"
+                result["content"] = content
+                result["media"].extend(media)
+                result["citations"] = citations
             
-            # Extract citations/links from content
-            result["citations"] = re.findall(r'https?://[^\s)\]>\'\"]+', result["content"])[:7]
+            if page_key is not None:
+                await set_cached_value(page_key, result, PAGE_CACHE_TTL)
 
         except Exception as e:
             result["error"] = f"URL loading failed: {str(e)}"
         
         return result
     
-    async def _format_sources(self, sources: dict) -> str:
+    @staticmethod
+    def _parse_html_sync(html: str, base_url: str) -> Tuple[Optional[str], str, List[str], List[str]]:
+        """
+        Extract the title, main text, first images and first outbound links from an HTML page (blocking).
+        
+        Args:
+            html: Page HTML
+            base_url: URL the page was loaded from, for resolving image links
+            
+        Returns:
+            Tuple of (title or None, text content, absolute image URLs, cited URLs)
+        """
+        soup = BeautifulSoup(html, HTML_PARSER)
+        
+        # Extract title
+        title_tag = soup.find('title')
+        title = title_tag.text if title_tag else None
+        
+        # Extract content
+        main_content = soup.find('main') or soup.find('article') or soup.find('body') or soup
+        content = main_content.get_text(separator='\n', strip=True)[:10000]
+        
+        # Citations are the content's absolute links, read off the anchors rather than rescanning the text
+        citations = [a['href'] for a in main_content.find_all('a', href=_ABSOLUTE_HREF_RE, limit=7)]
+        
+        # Extract images
+        media = []
+        for img in soup.find_all('img', limit=5):
+            src = img.get('src')
+            if src and not src.startswith('data:'):
+                media.append(urljoin(base_url, src))
+        
+        return title, content, media, citations
+    
+    async def _format_sources(self, sources: dict) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Format sources for the LLM.
         
@@ -451,10 +672,13 @@ class SourceFinder:
             sources: Dictionary of sources by platform
             
         Returns:
-            Formatted string of sources
+            Tuple of (formatted string of sources, numbered source references);
+            the references belong to this query alone, so callers pass them on
+            rather than keeping them on the shared instance
         """
-        self.source_references = []
+        references = []
         formatted = []
+        seen = set()
         
         for source_type, results in sources.items():
             if not results:
@@ -463,66 +687,72 @@ class SourceFinder:
             formatted.append(f"\n## {source_type.upper()} SOURCES\n")
             
             for idx, res in enumerate(results[:10], 1):
-                ref_num = len(self.source_references) + 1
+                title = res.get('title') or f"{source_type} source {idx}"
+                link = res.get('link', '')
+                
+                # The same page often comes back from several platforms; send it to the model once
+                key = link or title.strip().lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                
+                ref_num = len(references) + 1
+                snippet = res.get('snippet') or ''
+                media = res.get('media') or []
                 
                 # Ensure all required fields are present
                 source_entry = {
                     "num": ref_num,
-                    "title": res.get('title', f"{source_type} source {idx}"),
-                    "link": res.get('link', ''),
+                    "title": title,
+                    "link": link,
                     "source": source_type,
-                    "preview": res.get('snippet', ''),
-                    "images": res.get('media', []),
+                    "preview": snippet,
+                    "images": media,
                     "logo": res.get('logo', '')
                 }
                 
                 # Add to source references list
-                self.source_references.append(source_entry)
+                references.append(source_entry)
                 
-                entry = [
-                    f"### [Source {ref_num}] {res.get('title', f'{source_type} source {idx}')}",
-                    f"**Source Type:** {source_type}",
-                    f"**URL:** {res.get('link', '')}",
-                    f"**Preview:**\n{res.get('snippet', '')[:1000]}"
-                ]
+                entry = (
+                    f"### [Source {ref_num}] {title}\n"
+                    f"**Source Type:** {source_type}\n"
+                    f"**URL:** {link}\n"
+                    f"**Preview:**\n{_short(snippet, 1000)}"
+                )
                 
-                if res.get('media'):
+                if media:
                     # Convert all image entries to strings
-                    media_strs = [img if isinstance(img, str) else img.get('url', '') for img in res.get('media', [])[:3]]
-                    entry.append(f"**Media:** {', '.join(media_strs)}")
+                    entry += f"\n**Media:** {', '.join(filter(None, map(_norm_media, media[:3])))}"
                 
-                formatted.append("\n".join(entry) + "\n" + "-"*50 + "\n")
+                formatted.append(f"{entry}\n{SOURCE_DIVIDER}\n")
         
         # Debug output
-        print(f"Formatted {len(self.source_references)} source references")
-        if self.source_references:
-            for i, ref in enumerate(self.source_references[:3]):
-                print(f"Source {i+1}: {ref['title']} ({ref['source']})")
+        logger.debug("Formatted %d source references", len(references))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, ref in enumerate(references[:3]):
+                logger.debug("Source %d: %s (%s)", i + 1, ref['title'], ref['source'])
         
-        return "\n".join(formatted)
+        return "\n".join(formatted), references
     
-    async def _format_sources_with_media(self) -> str:
-        """Format media-rich sources for analysis"""
+    def _format_sources_with_media(self, references: List[Dict[str, Any]]) -> str:
+        """Format media-rich sources for analysis (from the references _format_sources built)"""
         media_sources = []
-        for ref in self.source_references:
-            if ref.get('media') or ref.get('images'):
-                media_list = ref.get('media', []) or ref.get('images', [])
+        for ref in references:
+            media_list = ref.get('media') or ref.get('images')
+            if media_list:
                 media_entry = [
                     f"Source {ref['num']}: {ref['title']}",
                     f"Media URLs:"
                 ]
                 
                 # Handle different media formats
-                for media_item in media_list[:3]:
-                    if isinstance(media_item, str):
-                        media_entry.append(f"- {media_item}")
-                    elif isinstance(media_item, dict) and 'url' in media_item:
-                        media_entry.append(f"- {media_item['url']}")
+                media_entry.extend(f"- {url}" for url in map(_norm_media, media_list[:3]) if url)
                 
                 # Add preview context if available
                 preview = ref.get('preview', '')
                 if preview:
-                    media_entry.append(f"Context: {preview[:500]}")
+                    media_entry.append(f"Context: {_short(preview, 500)}")
                 
                 media_sources.append("\n".join(media_entry))
         
@@ -538,34 +768,62 @@ class SourceFinder:
         Returns:
             Dictionary of sources by platform
         """
-        print(f"\n🌐 Starting multi-platform research operation")
+        sources = {platform: [] for platform in SOURCE_PLATFORMS}
+        async for platform, results in self.stream_all_sources(platform_queries):
+            sources[platform] = results
+        return sources
+    
+    async def stream_all_sources(self, platform_queries: dict) -> AsyncGenerator[Tuple[str, list], None]:
+        """
+        Conduct parallel searches, yielding each platform's results as soon as they arrive.
+        
+        Args:
+            platform_queries: Dictionary of platform-specific queries
+            
+        Yields:
+            Tuples of (platform, results), fastest platform first; platforms
+            still searching after SOURCE_SEARCH_DEADLINE seconds are cancelled
+        """
+        logger.info("🌐 Starting multi-platform research operation")
         
         search_tasks = [
-            ("1/5 Web", self.search_serp, platform_queries.get("Searpi", ""), 12),
-            ("2/5 News", self.search_news, platform_queries.get("NewsAPI", ""), 7, 15),
-            ("3/5 Twitter", self.search_twitter, platform_queries.get("Twitter", ""), 15),
-            ("4/5 Academic", self.search_arxiv, platform_queries.get("Arxiv", ""), 10),
-            ("5/5 Reddit", self.search_reddit, platform_queries.get("Reddit", ""), 10)
+            ("Web", "1/5 Web", self.search_serp, platform_queries.get("Searpi", ""), 12),
+            ("News", "2/5 News", self.search_news, platform_queries.get("NewsAPI", ""), 7, 15),
+            ("Twitter", "3/5 Twitter", self.search_twitter, platform_queries.get("Twitter", ""), 15),
+            ("Academic", "4/5 Academic", self.search_arxiv, platform_queries.get("Arxiv", ""), 10),
+            ("Reddit", "5/5 Reddit", self.search_reddit, platform_queries.get("Reddit", ""), 10)
         ]
-
-        # Execute all searches with individual timeouts
-        tasks = [self._tracked_search(func, name, *args, max_retries=2, timeout=25) 
-                for name, func, *args in search_tasks]
         
-        web_results, news_results, twitter_results, arxiv_results, reddit_results = await asyncio.gather(*tasks)
+        async def labelled(platform, coro):
+            # One platform failing must not cost the others their results
+            try:
+                return platform, await coro
+            except Exception as e:
+                logger.error("❌ [%s] Search failed: %s", platform, e)
+                return platform, []
         
-        # Process direct URL sources
-        url_sources = await self._process_urls_in_query(platform_queries)
-        self.source_references.extend(url_sources)
-
-        return {
-            "Web": web_results,
-            "News": news_results,
-            "Twitter": twitter_results,
-            "Academic": arxiv_results,
-            "Reddit": reddit_results,
-            "URLs": url_sources
-        }
+        # Execute all searches against one deadline, alongside the direct URL sources. Searches
+        # stop themselves slightly early, so the cancellation below is only a backstop
+        search_deadline = asyncio.get_running_loop().time() + SOURCE_SEARCH_DEADLINE - SEARCH_DEADLINE_MARGIN
+        tasks = [
+            asyncio.ensure_future(labelled(
+                platform, self._tracked_search(func, name, *args, deadline=search_deadline)
+            ))
+            for platform, name, func, *args in search_tasks
+        ]
+        tasks.append(asyncio.ensure_future(labelled("URLs", self._process_urls_in_query(platform_queries))))
+        
+        try:
+            # A stalled backend shouldn't hold up the whole query: past the deadline, go with what arrived
+            for next_done in asyncio.as_completed(tasks, timeout=SOURCE_SEARCH_DEADLINE):
+                platform, results = await next_done
+                yield platform, results
+        except asyncio.TimeoutError:
+            logger.warning("⏰ Source search deadline (%ss) passed; continuing with partial results", SOURCE_SEARCH_DEADLINE)
+        finally:
+            # The consumer may stop early; don't leave searches running
+            for task in tasks:
+                task.cancel()
     
     async def _process_urls_in_query(self, platform_queries):
         """
@@ -578,87 +836,73 @@ class SourceFinder:
             List of URL sources
         """
         url_results = []
-        urls = re.findall(r'https?://\S+', platform_queries.get("Searpi", ""))
+        urls = _URL_RE.findall(platform_queries.get("Searpi", ""))[:3]  # Limit to first 3 URLs
+        contents = await asyncio.gather(
+            *[asyncio.wait_for(self._load_url_content(url), timeout=20) for url in urls],
+            return_exceptions=True
+        )
         
-        for url in urls[:3]:  # Limit to first 3 URLs
-            content = await self._load_url_content(url)
+        for url, content in zip(urls, contents):
+            if isinstance(content, BaseException):
+                continue
             if not content.get("error"):
                 url_results.append({
-                    "title": f"Direct Source - {urlparse(url).netloc}",
+                    "title": f"Direct Source - {_netloc(url)}",
                     "link": url,
                     "media": content["media"],
-                    "snippet": content['content'][:500],
+                    "snippet": _short(content['content'], 500),
                     "source": "Direct URL"
                 })
         return url_results
     
-    async def _tracked_search(self, search_func, source_name, *args, **kwargs):
+    async def _tracked_search(self, search_func, source_name, *args, deadline: float, max_retries: int = SEARCH_RETRIES, **kwargs):
         """
-        Managed search with timing, error handling and retry logic.
+        Managed search with timing logs, error handling and retry logic.
+        
+        Every attempt shares the time left before ``deadline``: a timeout ends
+        the search, and failures are retried only while time remains.
         
         Args:
             search_func: The search function to call
             source_name: Name of the source
             *args: Arguments to pass to the search function
+            deadline: Event loop time (loop.time()) by which the search must finish
+            max_retries: Retries after a failed (not timed out) attempt
             **kwargs: Keyword arguments to pass to the search function
             
         Returns:
             List of search results
         """
-        max_retries = kwargs.pop('max_retries', 2)
-        timeout = kwargs.pop('timeout', 30)
-        
+        loop = asyncio.get_running_loop()
         start = time.time()
-        print(f"🔍 [{source_name}] Starting search...")
+        logger.debug("🔍 [%s] Starting search...", source_name)
         
         for attempt in range(max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
             try:
-                results = await asyncio.wait_for(search_func(*args, **kwargs), timeout=timeout)
+                results = await asyncio.wait_for(search_func(*args, **kwargs), timeout=remaining)
                 elapsed = time.time() - start
-                
-                # Store timing metrics
-                self.search_times[source_name] = {
-                    'elapsed': elapsed,
-                    'timestamp': datetime.now().isoformat(),
-                    'success': True,
-                    'results_count': len(results) if results else 0
-                }
-                
-                print(f"✅ [{source_name}] Found {len(results)} results ({elapsed:.1f}s)")
+                logger.info("✅ [%s] Found %d results (%.1fs)", source_name, len(results), elapsed)
                 return results
                 
             except asyncio.TimeoutError:
-                elapsed = time.time() - start
-                if attempt < max_retries:
-                    print(f"⏱️ [{source_name}] Timed out after {timeout}s, retrying ({attempt+1}/{max_retries})...")
-                else:
-                    print(f"⏰ [{source_name}] Timed out after {timeout}s, giving up")
-                    
-                    # Store failure metrics
-                    self.search_times[source_name] = {
-                        'elapsed': elapsed,
-                        'timestamp': datetime.now().isoformat(),
-                        'success': False,
-                        'error': 'Timeout'
-                    }
-                    return []
-                    
+                break
+                
             except Exception as e:
                 elapsed = time.time() - start
-                if attempt < max_retries:
-                    print(f"❌ [{source_name}] Failed ({elapsed:.1f}s): {str(e)}, retrying ({attempt+1}/{max_retries})...")
+                if attempt < max_retries and loop.time() < deadline:
+                    logger.warning("❌ [%s] Failed (%.1fs): %s, retrying (%d/%d)...", source_name, elapsed, e, attempt + 1, max_retries)
                 else:
-                    print(f"❌ [{source_name}] Failed ({elapsed:.1f}s): {str(e)}, giving up")
-                    
-                    # Store failure metrics
-                    self.search_times[source_name] = {
-                        'elapsed': elapsed,
-                        'timestamp': datetime.now().isoformat(),
-                        'success': False,
-                        'error': str(e)
-                    }
+                    logger.error("❌ [%s] Failed (%.1fs): %s, giving up", source_name, elapsed, e)
                     return []
+        
+        logger.warning("⏰ [%s] Out of time after %.1fs, giving up", source_name, time.time() - start)
+        return []
     
+    @ttl_cached(SEARCH_CACHE_TTL)
     async def search_serp(self, query: str, num_results: int = 10) -> list:
         """
         Search using SerpAPI.
@@ -672,7 +916,7 @@ class SourceFinder:
         """
         api_key = os.getenv("SERP_API_KEY")
         if not api_key:
-            print("❌ SERP_API_KEY missing")
+            logger.warning("❌ SERP_API_KEY missing")
             return []
 
         params = {
@@ -686,60 +930,62 @@ class SourceFinder:
 
         try:
             session = await self.create_session()
-            async with session.get("https://serpapi.com/search", params=params, timeout=15) as r:
-                if r.status != 200:
-                    print(f"❌ SERPAPI error: HTTP {r.status}")
-                    return []
-                    
-                try:
-                    data = await r.json()
-                except json.JSONDecodeError:
-                    print("❌ SERPAPI returned invalid JSON")
-                    return []
+            async with self._sem_for("serpapi.com"), self._sem:
+                async with session.get("https://serpapi.com/search", params=params, timeout=15) as r:
+                    if r.status != 200:
+                        logger.warning("❌ SERPAPI error: HTTP %s", r.status)
+                        return []
+                        
+                    try:
+                        data = orjson.loads(await r.read())
+                    except orjson.JSONDecodeError:
+                        logger.warning("❌ SERPAPI returned invalid JSON")
+                        return []
+                        
+                    if data.get("error"):
+                        logger.warning("❌ SERPAPI error: %s", data['error'])
+                        return []
                     
-                if data.get("error"):
-                    print(f"❌ SERPAPI error: {data['error']}")
-                    return []
-                
-                results = []
-                
-                # Process organic results
-                for res in data.get("organic_results", []):
-                    snippet = res.get("snippet", "")
-                    if not snippet and res.get("rich_snippet"):
-                        # Try to extract text from rich snippets
-                        rich = res.get("rich_snippet", {})
-                        if rich.get("top", {}).get("detected_extensions"):
-                            snippet = " ".join(rich["top"]["detected_extensions"].values())
+                    results = []
                     
-                    # Handle images in snippets        
-                    cleaned_snippet = self.handle_images(snippet)
+                    # Process organic results
+                    for res in data.get("organic_results", []):
+                        snippet = res.get("snippet", "")
+                        if not snippet and res.get("rich_snippet"):
+                            # Try to extract text from rich snippets
+                            rich = res.get("rich_snippet", {})
+                            if rich.get("top", {}).get("detected_extensions"):
+                                snippet = " ".join(rich["top"]["detected_extensions"].values())
+                        
+                        # Handle images in snippets        
+                        cleaned_snippet = self.handle_images(snippet)
+                        
+                        results.append({
+                            "title": res.get("title", ""),
+                            "link": res.get("link", ""),
+                            "snippet": cleaned_snippet,
+                            "source": "SERP",
+                            "position": res.get("position", 0)
+                        })
                     
-                    results.append({
-                        "title": res.get("title", ""),
-                        "link": res.get("link", ""),
-                        "snippet": cleaned_snippet,
-                        "source": "SERP",
-                        "position": res.get("position", 0)
-                    })
-                
-                # Also include knowledge graph if available
-                if data.get("knowledge_graph"):
-                    kg = data["knowledge_graph"]
-                    description = kg.get("description", "")
-                    results.append({
-                        "title": kg.get("title", "Knowledge Panel"),
-                        "link": kg.get("website", ""),
-                        "snippet": self.handle_images(description),
-                        "source": "Knowledge Graph"
-                    })
+                    # Also include knowledge graph if available
+                    if data.get("knowledge_graph"):
+                        kg = data["knowledge_graph"]
+                        description = kg.get("description", "")
+                        results.append({
+                            "title": kg.get("title", "Knowledge Panel"),
+                            "link": kg.get("website", ""),
+                            "snippet": self.handle_images(description),
+                            "source": "Knowledge Graph"
+                        })
+                        
+                    return results
                     
-                return results
-                
         except Exception as e:
-            print(f"❌ SERP error: {e}")
+            logger.error("❌ SERP error: %s", e)
             return []
     
+    @ttl_cached(SEARCH_CACHE_TTL)
     async def search_news(self, query: str, days_back: int = 30, page_size: int = 10) -> list:
         """
         Search NewsAPI.
@@ -754,7 +1000,7 @@ class SourceFinder:
         """
         api_key = os.getenv("NEWS_API_KEY")
         if not api_key:
-            print("❌ NEWS_API_KEY missing")
+            logger.warning("❌ NEWS_API_KEY missing")
             return []
 
         from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
@@ -769,69 +1015,40 @@ class SourceFinder:
 
         try:
             session = await self.create_session()
-            async with session.get("https://newsapi.org/v2/everything", params=params, timeout=10) as r:
-                if r.status != 200:
-                    error_text = await r.text()
-                    print(f"❌ NewsAPI error: HTTP {r.status} - {error_text[:100]}")
-                    
-                    # Try headlines endpoint as fallback
-                    print("⚠️ Trying top headlines as fallback...")
-                    headline_params = {
-                        "apiKey": api_key,
-                        "q": query,
-                        "language": "en",
-                        "pageSize": page_size
-                    }
-                    
-                    async with session.get("https://newsapi.org/v2/top-headlines", params=headline_params, timeout=10) as hr:
-                        if hr.status != 200:
-                            return []
-                        data = await hr.json()
-                else:
-                    data = await r.json()
-                
-                if data.get("status") != "ok":
-                    print(f"❌ NewsAPI returned error: {data.get('message', 'Unknown error')}")
-                    return []
-                
-                results = []
-                for article in data.get("articles", []):
-                    # Format date nicely
-                    pub_date = article.get("publishedAt", "")
-                    if pub_date:
-                        try:
-                            dt = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
-                            formatted_date = dt.strftime("%b %d, %Y")
-                        except ValueError:
-                            formatted_date = pub_date
+            # One set of permits covers the headlines fallback too, as it runs sequentially
+            async with self._sem_for("newsapi.org"), self._sem:
+                async with session.get("https://newsapi.org/v2/everything", params=params, timeout=10) as r:
+                    if r.status != 200:
+                        error_text = await r.text()
+                        logger.warning("❌ NewsAPI error: HTTP %s - %s", r.status, error_text[:100])
+                        
+                        # Try headlines endpoint as fallback
+                        logger.info("⚠️ Trying top headlines as fallback...")
+                        headline_params = {
+                            "apiKey": api_key,
+                            "q": query,
+                            "language": "en",
+                            "pageSize": page_size
+                        }
+                        
+                        async with session.get("https://newsapi.org/v2/top-headlines", params=headline_params, timeout=10) as hr:
+                            if hr.status != 200:
+                                return []
+                            data = orjson.loads(await hr.read())
                     else:
-                        formatted_date = ""
+                        data = orjson.loads(await r.read())
                     
-                    # Process description and content
-                    description = article.get("description", "")
-                    content = article.get("content", "")
+                    if data.get("status") != "ok":
+                        logger.warning("❌ NewsAPI returned error: %s", data.get('message', 'Unknown error'))
+                        return []
                     
-                    # Use content if description is too short
-                    if description and len(description) < 30 and content:
-                        snippet = content[:150]
-                    else:
-                        snippet = description
+                    return [self._news_result(article) for article in data.get("articles") or []]
                     
-                    results.append({
-                        "title": article.get("title", ""),
-                        "link": article.get("url", ""),
-                        "snippet": self.handle_images(snippet),
-                        "source": article.get("source", {}).get("name", "NewsAPI"),
-                        "published_at": formatted_date,
-                        "author": article.get("author", "")
-                    })
-                
-                return results
-                
         except Exception as e:
-            print(f"❌ NewsAPI error: {e}")
+            logger.error("❌ NewsAPI error: %s", e)
             return []
     
+    @ttl_cached(TWITTER_CACHE_TTL)
     async def search_twitter(self, query: str, count: int = 10) -> list:
         """
         Search Twitter.
@@ -847,16 +1064,14 @@ class SourceFinder:
             return []
 
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.twitter.search_recent_tweets(
-                    query,
-                    max_results=count,
-                    tweet_fields=["created_at", "public_metrics", "author_id"],
-                    expansions=["author_id"],
-                    user_fields=["username"]
-                )
+            # tweepy is synchronous, so run the request in a worker thread
+            response = await asyncio.to_thread(
+                self.twitter.search_recent_tweets,
+                query,
+                max_results=count,
+                tweet_fields=["created_at", "public_metrics", "author_id"],
+                expansions=["author_id"],
+                user_fields=["username"]
             )
 
             processed = []
@@ -872,9 +1087,10 @@ class SourceFinder:
                 })
             return processed
         except Exception as e:
-            print(f"Twitter error: {str(e)}")
+            logger.error("Twitter error: %s", e)
             return []
     
+    @ttl_cached(SEARCH_CACHE_TTL)
     async def search_arxiv(self, query: str, max_records: int = 10) -> list:
         """
         Search arXiv.
@@ -887,20 +1103,22 @@ class SourceFinder:
             List of search results
         """
         try:
-            client = arxiv.Client()
+            # One page of exactly max_records, instead of the default 100-result page; fail fast on errors
+            client = arxiv.Client(page_size=max_records, num_retries=1)
             search = arxiv.Search(query=query, max_results=max_records)
-            # Use async wrapper for synchronous client
-            results = await asyncio.to_thread(client.results, search)
+            # The client is synchronous and fetches lazily, so consume the results in a worker thread
+            results = await asyncio.to_thread(lambda: list(client.results(search)))
             return [{
                 "title": result.title,
                 "link": result.entry_id,
-                "snippet": f"{result.summary[:150]}...",
+                "snippet": f"{_short(result.summary, 150)}...",
                 "source": "Arxiv"
             } for result in results]
         except Exception as e:
-            print(f"Arxiv error: {e}")
+            logger.error("Arxiv error: %s", e)
             return []
     
+    @ttl_cached(SEARCH_CACHE_TTL)
     async def search_reddit(self, query: str, limit: int = 10) -> list:
         """
         Search Reddit.
@@ -916,31 +1134,55 @@ class SourceFinder:
             return []
 
         try:
-            results = []
             subreddit = await self.reddit.subreddit("all")
-            async for post in subreddit.search(query, limit=limit, sort="relevance"):
-                media = []
-                if hasattr(post, 'media_metadata'):
-                    for item in post.media_metadata.values():
-                        if item.get('s'):
-                            media.append(item['s']['u'])
-                
-                results.append({
-                    "title": post.title,
-                    "link": f"https://reddit.com{post.permalink}",
-                    "snippet": post.selftext[:500] + ('...' if len(post.selftext) > 500 else ''),
-                    "source": "Reddit",
-                    "score": post.score,
-                    "flair": post.link_flair_text,
-                    "media": media[:3],
-                    "created_utc": post.created_utc
-                })
-            return results
+            return [
+                self._reddit_result(post)
+                async for post in subreddit.search(query, limit=limit, sort="relevance")
+            ]
             
         except Exception as e:
-            print(f"❌ Reddit error: {e}")
+            logger.error("❌ Reddit error: %s", e)
             return []
     
+    def _news_result(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a NewsAPI article into a search result."""
+        # NewsAPI sends null for missing fields, so fall back with `or` rather than .get defaults
+        description = article.get("description") or ""
+        content = article.get("content") or ""
+        
+        # Use content if description is too short
+        if description and len(description) < 30 and content:
+            snippet = _short(content, 150)
+        else:
+            snippet = description
+        
+        return {
+            "title": article.get("title") or "",
+            "link": article.get("url") or "",
+            "snippet": self.handle_images(snippet),
+            "source": (article.get("source") or {}).get("name", "NewsAPI"),
+            "published_at": _format_news_date(article.get("publishedAt") or ""),
+            "author": article.get("author") or ""
+        }
+    
+    @staticmethod
+    def _reddit_result(post) -> Dict[str, Any]:
+        """Convert a Reddit submission into a search result."""
+        # Only the first three images are kept, so stop looking after those
+        metadata = getattr(post, 'media_metadata', None) or {}
+        media = list(islice((item['s']['u'] for item in metadata.values() if item.get('s')), 3))
+        selftext = post.selftext
+        return {
+            "title": post.title,
+            "link": REDDIT_URL + post.permalink,
+            "snippet": _short(selftext, 500) + ('...' if len(selftext) > 500 else ''),
+            "source": "Reddit",
+            "score": post.score,
+            "flair": post.link_flair_text,
+            "media": media,
+            "created_utc": post.created_utc
+        }
+    
     def handle_images(self, content: str) -> str:
         """
         Replace image URLs with placeholders.
@@ -953,19 +1195,10 @@ class SourceFinder:
         """
         if not content:
             return ""
-            
-        # Handle more image URL patterns
-        patterns = [
-            r'(?:https?://\S+?\.(?:jpg|jpeg|png|gif|webp|svg))',
-            r'(?:data:image/[a-z]+;base64,[a-zA-Z0-9+/=]+)',
-            r'(?:src=[\'\"]https?://\S+?\.(?:jpg|jpeg|png|gif|webp|svg)[\'\"])'
-        ]
-        
-        processed = content
-        for pattern in patterns:
-            processed = re.sub(pattern, "[IMAGE]", processed)
-            
-        return processed
+        # Most snippets have no URL or inline image at all; substring checks are far cheaper than the regex
+        if "://" not in content and ";base64," not in content:
+            return content
+        return _IMAGE_RE.sub("[IMAGE]", content)
 
     async def process_query(self, query: str, chat_history=None, filters=None) -> tuple:
         """
@@ -979,10 +1212,33 @@ class SourceFinder:
         Returns:
             Tuple of (response_text, sources)
         """
-        try:
-            # Reset source references for this query
-            self.source_references = []
+        response_text = ""
+        sources = []
+        async for event, value in self.stream_query(query, chat_history=chat_history, filters=filters):
+            if event == "delta":
+                response_text += value
+            elif event == "sources":
+                sources = value
+            else:
+                # Errors replace whatever was generated so far
+                response_text = value
+        
+        return response_text, sources
+
+    async def stream_query(self, query: str, chat_history=None, filters=None) -> AsyncGenerator[Tuple[str, Any], None]:
+        """
+        Process a user query, yielding the response as it is generated.
+        
+        Args:
+            query: The user query to process
+            chat_history: Optional chat history for conversation context
+            filters: Optional list of source types to include (e.g., ["Reddit", "Twitter"])
             
+        Yields:
+            ("delta", text) per response chunk, then ("sources", sources) once
+            the response is complete, or ("error", message) if processing failed
+        """
+        try:
             # Track the user's filter preferences
             selected_sources = None
             
@@ -992,24 +1248,14 @@ class SourceFinder:
             # Apply source filters if provided
             if filters and isinstance(filters, list):
                 # Save the original filter list for final filtering
-                selected_sources = filters
+                selected_sources = frozenset(filters)
                 
                 # Filter the platform queries to only include selected sources
                 filtered_queries = {}
-                source_mapping = {
-                    "Reddit": "Reddit",
-                    "Twitter": "Twitter", 
-                    "Web": "Searpi",
-                    "News": "NewsAPI",
-                    "Academic": "Arxiv"
-                }
-                
-                # Create reverse mapping for later filtering
-                reverse_mapping = {v: k for k, v in source_mapping.items()}
-                
                 for source in filters:
-                    if source in source_mapping and source_mapping[source] in platform_queries:
-                        filtered_queries[source_mapping[source]] = platform_queries[source_mapping[source]]
+                    platform = FILTER_PLATFORMS.get(source)
+                    if platform in platform_queries:
+                        filtered_queries[platform] = platform_queries[platform]
                 
                 # If we have valid filters, use them; otherwise use all sources
                 if filtered_queries:
@@ -1018,63 +1264,43 @@ class SourceFinder:
             # Get sources from all platforms
             sources = await self.get_all_sources(platform_queries)
             
+            # Number the sources for the model; the references stay local to this query
+            formatted_sources, references = await self._format_sources(sources)
+            
             # Generate response using chat history for context
-            response_text = ""
-            async for chunk in self.generate_response(query, sources, chat_history):
-                response_text += chunk
+            async for chunk in self.generate_response(query, formatted_sources, references, chat_history):
+                yield "delta", chunk
             
             # Debug info for source references
-            print(f"Source references count: {len(self.source_references)}")
-            if self.source_references:
-                print(f"First source reference: {self.source_references[0]}")
+            logger.debug("Source references count: %d", len(references))
+            if references:
+                logger.debug("First source reference: %s", references[0])
             
-            # Filter source_references if needed
+            # Filter references if needed
             if selected_sources:
-                # Create a new filtered list based on user selections
+                # Only include sources whose (normalized) type was specified in the filters
                 filtered_references = []
-                
-                # Map source types to match filter names
-                source_type_mapping = {
-                    "SERP": "Web",
-                    "Web": "Web",
-                    "Knowledge Graph": "Web",
-                    "NewsAPI": "News",
-                    "News": "News",
-                    "Twitter": "Twitter",
-                    "Arxiv": "Academic",
-                    "Academic": "Academic",
-                    "Reddit": "Reddit",
-                    "Direct URL": "Web"
-                }
-                
-                # Only include sources that were specified in the filters
-                for ref in self.source_references:
+                for ref in references:
                     source_type = ref.get("source", "")
-                    normalized_type = source_type_mapping.get(source_type, source_type)
-                    
-                    if normalized_type in selected_sources:
+                    if SOURCE_TYPE_FILTERS.get(source_type, source_type) in selected_sources:
                         filtered_references.append(ref)
                 
-                return response_text, filtered_references
-            
-            # Make a deep copy of source_references to avoid issues with reference sharing
-            import copy
-            result_sources = copy.deepcopy(self.source_references)
+                yield "sources", filtered_references
+                return
             
-            return response_text, result_sources
+            yield "sources", references
         except Exception as e:
-            print(f"Error in process_query: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return f"I apologize, but I encountered an error while processing your query: {str(e)}", []
+            logger.exception("Error in stream_query: %s", e)
+            yield "error", f"I apologize, but I encountered an error while processing your query: {str(e)}"
 
-    async def generate_response(self, query: str, sources: dict, chat_history=None) -> AsyncGenerator[str, None]:
+    async def generate_response(self, query: str, formatted_sources: str, references: List[Dict[str, Any]], chat_history=None) -> AsyncGenerator[str, None]:
         """
         Generate streaming analysis with media verification and conversation history.
         
         Args:
             query: The user query
-            sources: Dictionary of sources by platform
+            formatted_sources: Sources formatted for the model by _format_sources
+            references: The source references _format_sources returned with them
             chat_history: Optional chat history for context
             
         Returns:
@@ -1084,103 +1310,64 @@ class SourceFinder:
             yield "❌ AI service unavailable - check API configuration"
             return
 
-        formatted_sources = await self._format_sources(sources)
-        media_analysis = await self._format_sources_with_media()
+        media_analysis = self._format_sources_with_media(references)
         
         # Format chat history for context if available
         conversation_context = ""
-        if chat_history and len(chat_history) > 0:
-            conversation_context = "**Previous Conversation**\n"
-            for msg in chat_history:
-                if hasattr(msg, 'role') and hasattr(msg, 'content'):
-                    if msg.role == "user":
-                        conversation_context += f"User: {msg.content}\n"
-                    elif msg.role == "assistant":
-                        conversation_context += f"Assistant: {msg.content}\n"
-            conversation_context += "\n"
-
-        system_instruction = """**Research Analysis Protocol**
-1. Cross-reference all sources for consensus/conflicts
-2. Validate media against source context
-3. Highlight statistical significance
-4. Note temporal relevance
-5. Rate source credibility
-6. Maintain neutral academic tone
-7. Analyze all provided sources thoroughly
-8. Structure response with these sections:
-- 📌 Executive Summary (3-5 bullet points)
-- 🔍 Key Findings (numbered list with citations [1][2])
-- ⚖️ Controversies/Debates
-- ❓ Unanswered Questions
-- 📚 Recommended Further Research
-9. Use markdown formatting with **bold** and italics
-10. Always cite sources using [number] notation
-11. Highlight statistics with ✅
-12. Mention conflicting viewpoints with ⚠️
-13. Reference previous conversation context if provided
-This is solely majored for researchers. Create a follow up questions to help them better explore their question.
-Make it very detailed include points that i might have not specified. make sure it aligns t ath that will help the researcher in their research 
-Don't include anything related to this at the beginning of your answer: "Based on the provided sources"
-Include any other points that might help the users based on their specific requests/question in other to help the researcher explore amd get the right materials for their research 
-"""
+        if chat_history:
+            parts = ["**Previous Conversation**\n"]
+            for msg in chat_history[-PROMPT_HISTORY_MESSAGES:]:
+                role, content = _history_message(msg)
+                speaker = HISTORY_SPEAKERS.get(role)
+                if speaker and content:
+                    parts.append(f"{speaker}: {content}\n")
+            parts.append("\n")
+            conversation_context = "".join(parts)
 
-        typing_task = asyncio.create_task(self._async_typing("Analyzing multi-source evidence..."))
+        # The animation is only for an interactive terminal; servers skip it entirely
+        typing_task = asyncio.create_task(self._async_typing("Analyzing multi-source evidence...")) if TYPING_ANIMATION else None
 
         try:
-            loop = asyncio.get_event_loop()
-            
-            # Wrap the synchronous generator in an async iterator
-            response_stream = await loop.run_in_executor(
-                None,
-                lambda: self.genai_client.models.generate_content_stream(
-                    model=MODEL_ID,
-                    config=GenerateContentConfig(
-                        temperature=0.2,
-                        tools=[Tool(google_search={})],
-                        safety_settings=SAFETY_SETTINGS,
-                        system_instruction=system_instruction
-                    ),
-                    contents=[{
-                        "role": "user",
-                        "parts": [{
-                            "text": f"""**Research Request**
-Query: {query}
-
-{conversation_context}
-**Aggregated Sources**
-{formatted_sources}
-
-**Media Analysis Context**
-{media_analysis}
-
-**Analysis Guidelines**
-- Verify image/video timestamps against claims
-- Check for source domain reputation
-- Compare academic vs social media perspectives
-- Highlight significant statistical outliers"""
-                        }]
+            # The async client streams natively, without holding an executor thread
+            response_stream = await self.genai_client.aio.models.generate_content_stream(
+                model=MODEL_ID,
+                config=GenerateContentConfig(
+                    temperature=0.2,
+                    tools=[Tool(google_search={})],
+                    safety_settings=SAFETY_SETTINGS,
+                    system_instruction=ANALYSIS_INSTRUCTION
+                ),
+                contents=[{
+                    "role": "user",
+                    "parts": [{
+                        "text": ANALYSIS_PROMPT.format_map({
+                            "query": query,
+                            "conversation_context": conversation_context,
+                            "formatted_sources": formatted_sources,
+                            "media_analysis": media_analysis
+                        })
                     }]
-                )
+                }]
             )
 
-            typing_task.cancel()
-            try:
-                await typing_task
-            except asyncio.CancelledError:
-                pass
+            if typing_task is not None:
+                typing_task.cancel()
+                try:
+                    await typing_task
+                except asyncio.CancelledError:
+                    pass
 
             # Stream response
-            full_response = ""
-            for chunk in response_stream:
-                if hasattr(chunk, 'text'):
-                    full_response += chunk.text
-                    yield chunk.text
+            async for chunk in response_stream:
+                text = getattr(chunk, 'text', None)
+                if text:
+                    yield text
             
             # Add source gallery if we have sources
-         #   if self.source_references:
+         #   if references:
              #   source_gallery = "\n\n## 📚 Source Gallery\n" + "\n".join(
                #     f"{ref['num']}. **[{ref['source']}] {ref['title']}**\n{ref['link']}"
-              #      for ref in self.source_references
+              #      for ref in references
            #     )
            #     yield source_gallery
         #    else:
@@ -1189,9 +1376,7 @@ Query: {query}
 
         except Exception as e:
             error_message = f"❌ Analysis generation failed: {str(e)}"
-            print(error_message)
-            import traceback
-            print(traceback.format_exc())
+            logger.exception(error_message)
             yield error_message
 
     async def _async_typing(self, message: str):
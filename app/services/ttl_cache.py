@@ -0,0 +1,76 @@
+"""
+Small in-process cache with LRU eviction and per-entry expiry.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+import time
+
+class TTLCache(OrderedDict):
+    """
+    LRU mapping whose entries also expire ``ttl`` seconds after being set.
+    
+    Only touched from the event loop thread, so no locking is needed.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries; the least recently used is evicted past this
+            ttl: Seconds an entry stays valid after it is set
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry and mark it most recently used, or ``default``."""
+        entry = super().get(key)
+        if entry is None:
+            return default
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self[key]
+            return default
+        
+        self.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry (for ``ttl`` seconds if given), evicting the least recently used ones past ``maxsize``."""
+        super().__setitem__(key, (time.monotonic() + (self.ttl if ttl is None else ttl), value))
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+def ttl_cached(ttl: float, maxsize: int = 512) -> Callable:
+    """
+    Cache an async search method's non-empty results for ``ttl`` seconds.
+    
+    Entries are keyed by the normalized query (the first argument after
+    ``self``) and the remaining arguments. Empty results are not cached, since
+    they are also what a failed or rate-limited search returns.
+    """
+    def decorator(func: Callable) -> Callable:
+        results = TTLCache(maxsize, ttl)
+        
+        @wraps(func)
+        async def wrapper(self, query: str, *args, **kwargs):
+            key = (query.strip().lower(), args, tuple(sorted(kwargs.items())))
+            cached = results.get(key)
+            if cached is not None:
+                return list(cached)
+            
+            found = await func(self, query, *args, **kwargs)
+            if found:
+                results.set(key, list(found))
+            return found
+        
+        wrapper.cache = results
+        return wrapper
+    
+    return decorator
\ No newline at end of file
@@ -5,14 +5,149 @@ This module provides functionality to verify information across multiple sources
 and implement stimulated verification techniques to assess information reliability.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Literal, Optional, Set, Tuple, Any
 import re
-from datetime import datetime
+import importlib.util
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timezone
+from functools import cached_property, lru_cache
+from itertools import chain
+from urllib.parse import urlparse
 import numpy as np
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, ConfigDict
+
+from app.services.ttl_cache import TTLCache
+
+# pyahocorasick finds every key fact in a snippet in one pass; fall back to substring checks without it
+if importlib.util.find_spec("ahocorasick"):
+    import ahocorasick
+else:
+    ahocorasick = None
+
+# Each pattern list is one alternation, so a single scan counts every pattern
+_MISINFORMATION_RE = re.compile(
+    r"conspiracy|hoax|fake news|misinformation|disinformation"
+    r"|unverified|unconfirmed|rumor|speculation",
+    re.IGNORECASE
+)
+_RELIABLE_RE = re.compile(
+    r"according to|reported by|confirmed by|verified|official"
+    r"|statement|announcement|press release",
+    re.IGNORECASE
+)
+# Whole words only, so "nothing" or "notable" don't read as negations
+_NEGATION_RE = re.compile(
+    r"\b(?:not|cannot|never|didn't|doesn't|haven't|hasn't|won't|wouldn't"
+    r"|couldn't|shouldn't|isn't|aren't|wasn't|weren't)\b",
+    re.IGNORECASE
+)
+_SENTENCE_END_RE = re.compile(r"[.!?]+")
+
+# Matched against a URL's host and its parent domains ("gov" and "edu" cover TLDs)
+_CREDIBLE_DOMAINS = frozenset({
+    "reuters.com", "apnews.com", "bbc.com", "nytimes.com", "washingtonpost.com",
+    "theguardian.com", "cnn.com", "npr.org", "scientificamerican.com",
+    "nature.com", "science.org", "who.int", "cdc.gov", "nih.gov", "gov", "edu"
+})
+_LESS_CREDIBLE_DOMAINS = frozenset({
+    "blogspot.com", "wordpress.com", "medium.com", "tumblr.com",
+    "facebook.com", "twitter.com", "instagram.com", "tiktok.com"
+})
+
+# Verification is deterministic; results are kept for repeat (information, sources, method) calls
+VERIFICATION_CACHE_SIZE = 256
+VERIFICATION_CACHE_TTL = 3600
+# Worker threads a batch may occupy at once, leaving the default executor to other callers
+VERIFICATION_BATCH_CONCURRENCY = 4
+
+# Weights of the cross-reference, fact-checking, source-credibility and temporal scores
+_STIMULATED_WEIGHTS = (0.3, 0.2, 0.3, 0.2)
+
+# Score of a fact found in 0, 1, 2 and 3+ sources
+_FACT_SCORE_BY_SOURCE_COUNT = np.array([0.0, 0.5, 0.8, 1.0])
+
+@lru_cache(maxsize=1024)
+def _host_suffixes(url: str) -> frozenset:
+    """Get a URL's host and each parent domain, e.g. news.bbc.com -> {news.bbc.com, bbc.com, com}."""
+    try:
+        host = urlparse(url).hostname or ""
+    except ValueError:
+        return frozenset()
+    labels = host.split(".")
+    return frozenset(".".join(labels[i:]) for i in range(len(labels)))
+
+def _verification_key(information: str, sources: List[Dict[str, Any]], method: str) -> Tuple[bytes, bytes, str]:
+    """Key a verification by blake2b digests of its inputs (hashing is far cheaper than verifying)."""
+    sources_json = orjson.dumps(sources, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return (
+        hashlib.blake2b(information.encode(), digest_size=16).digest(),
+        hashlib.blake2b(sources_json, digest_size=16).digest(),
+        method
+    )
+
+class _PreparedSource:
+    """
+    A source's fields as the verification methods read them.
+    
+    Derived values (lowercased text, host domains, timestamp) are computed
+    on first use and then shared, so stimulated verification's four passes
+    over the same sources don't each redo them.
+    """
+    
+    def __init__(self, source: Dict[str, Any]):
+        self.link = source.get("link", "")
+        # SourceFinder's sources carry no id; their link identifies them
+        self.id = source.get("id") or self.link
+        self.text = source.get("snippet", "")
+        self.raw_date = source.get("date")
+    
+    @cached_property
+    def text_lower(self) -> str:
+        """The snippet, lowercased."""
+        return self.text.lower()
+    
+    @cached_property
+    def has_negation(self) -> bool:
+        """Whether the snippet contains a negation."""
+        return _NEGATION_RE.search(self.text) is not None
+    
+    @cached_property
+    def domains(self) -> frozenset:
+        """The link's host and parent domains."""
+        return _host_suffixes(self.link)
+    
+    @cached_property
+    def timestamp(self) -> Optional[float]:
+        """The ISO date as a POSIX timestamp (naive dates taken as UTC), or None if missing or malformed."""
+        try:
+            date = datetime.fromisoformat(self.raw_date.replace("Z", "+00:00"))
+        except (AttributeError, ValueError, TypeError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date.timestamp()
+
+# Method names SourceVerifier accepts (the keys of SourceVerifier._METHODS)
+VerificationMethod = Literal[
+    "cross_reference",
+    "fact_checking",
+    "source_credibility",
+    "temporal_analysis",
+    "stimulated_verification"
+]
 
 class VerificationResult(BaseModel):
-    """Model for verification results."""
+    """
+    Model for verification results.
+    
+    Results are built from values the verifier computed itself, so its
+    methods construct them without validation (model_construct).
+    """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     is_verified: bool
     confidence_score: float
     verification_method: str
@@ -28,15 +163,20 @@ class SourceVerifier:
     the reliability of information found across different sources.
     """
     
+    # Verification method name -> name of the method implementing it
+    _METHODS = {
+        "cross_reference": "_cross_reference_verification",
+        "fact_checking": "_fact_checking_verification",
+        "source_credibility": "_source_credibility_verification",
+        "temporal_analysis": "_temporal_analysis_verification",
+        "stimulated_verification": "_stimulated_verification"
+    }
+    
     def __init__(self):
         """Initialize the SourceVerifier."""
-        self.verification_methods = {
-            "cross_reference": self._cross_reference_verification,
-            "fact_checking": self._fact_checking_verification,
-            "source_credibility": self._source_credibility_verification,
-            "temporal_analysis": self._temporal_analysis_verification,
-            "stimulated_verification": self._stimulated_verification
-        }
+        # Verifications run in worker threads too (verify_information_async), so guard the cache
+        self._results = TTLCache(VERIFICATION_CACHE_SIZE, VERIFICATION_CACHE_TTL)
+        self._results_lock = threading.Lock()
     
     def verify_information(self, 
                           information: str, 
@@ -53,14 +193,91 @@ class SourceVerifier:
         Returns:
             VerificationResult object containing verification details
         """
-        if method not in self.verification_methods:
+        if method not in self._METHODS:
             raise ValueError(f"Unknown verification method: {method}")
             
-        return self.verification_methods[method](information, sources)
+        key = _verification_key(information, sources, method)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        return self._verify(key, information, sources, method)
+    
+    async def verify_information_async(self, 
+                                       information: str, 
+                                       sources: List[Dict[str, Any]], 
+                                       method: str = "cross_reference") -> VerificationResult:
+        """
+        Verify information in a worker thread, keeping the event loop free.
+        
+        Verification is pure-Python CPU work, so running its sub-methods in
+        separate threads would only contend for the GIL; the whole
+        verification is offloaded at once instead.
+        
+        Args:
+            information: The information to verify
+            sources: List of sources containing the information
+            method: Verification method to use
+            
+        Returns:
+            VerificationResult object containing verification details
+        """
+        if method not in self._METHODS:
+            raise ValueError(f"Unknown verification method: {method}")
+            
+        key = _verification_key(information, sources, method)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self._verify, key, information, sources, method)
+    
+    async def verify_information_batch(self, 
+                                       items: List[Tuple[str, List[Dict[str, Any]]]], 
+                                       method: str = "stimulated_verification", 
+                                       max_concurrency: int = VERIFICATION_BATCH_CONCURRENCY) -> List[VerificationResult]:
+        """
+        Verify several (information, sources) pairs concurrently.
+        
+        Args:
+            items: (information, sources) pairs to verify
+            method: Verification method to use for every pair
+            max_concurrency: Maximum number of verifications running at once
+            
+        Returns:
+            VerificationResult objects, in the order of ``items``
+        """
+        if method not in self._METHODS:
+            raise ValueError(f"Unknown verification method: {method}")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def verify_one(information: str, sources: List[Dict[str, Any]]) -> VerificationResult:
+            async with semaphore:
+                return await self.verify_information_async(information, sources, method)
+        
+        return await asyncio.gather(*(verify_one(information, sources) for information, sources in items))
+    
+    def _cached_result(self, key: Tuple[bytes, bytes, str]) -> Optional[VerificationResult]:
+        """Get a copy of a cached verification result, or None on a miss."""
+        with self._results_lock:
+            cached = self._results.get(key)
+        # Frozen only blocks reassigning fields; the lists and dicts inside stay
+        # mutable, so each caller gets its own copy
+        return cached.model_copy(deep=True) if cached is not None else None
+    
+    def _verify(self, 
+                key: Tuple[bytes, bytes, str], 
+                information: str, 
+                sources: List[Dict[str, Any]], 
+                method: str) -> VerificationResult:
+        """Run a verification method, caching a private copy of its result."""
+        result = getattr(self, self._METHODS[method])(information, [_PreparedSource(s) for s in sources])
+        with self._results_lock:
+            self._results.set(key, result.model_copy(deep=True))
+        return result
     
     def _cross_reference_verification(self, 
                                      information: str, 
-                                     sources: List[Dict[str, Any]]) -> VerificationResult:
+                                     sources: List[_PreparedSource]) -> VerificationResult:
         """
         Verify information by cross-referencing across multiple sources.
         
@@ -69,29 +286,30 @@ class SourceVerifier:
         """
         # Extract key facts from the information
         key_facts = self._extract_key_facts(information)
+        if not key_facts:
+            return self._neutral_result("cross_reference", {"key_facts": [], "fact_scores": {}})
         
         # Check each source for the key facts
-        supporting_sources = []
-        conflicting_sources = []
+        # Dicts as insertion-ordered sets: O(1) membership, stable output order
+        supporting_sources: Dict[str, None] = {}
+        conflicting_sources: Dict[str, None] = {}
         fact_scores = {}
+        match_facts = self._build_fact_matcher(key_facts)
+        key_facts_lower = [fact.lower() for fact in key_facts]
         
         for source in sources:
-            source_text = source.get("snippet", "")
-            source_id = source.get("id", "")
+            source_id = source.id
+            found_facts = match_facts(source.text)
             
             # Check each key fact against the source
-            for fact in key_facts:
-                if fact in source_text:
-                    if fact not in fact_scores:
-                        fact_scores[fact] = []
-                    fact_scores[fact].append(source_id)
-                    if source_id not in supporting_sources:
-                        supporting_sources.append(source_id)
+            for fact, fact_lower in zip(key_facts, key_facts_lower):
+                if fact in found_facts:
+                    fact_scores.setdefault(fact, []).append(source_id)
+                    supporting_sources[source_id] = None
                 else:
                     # Check for conflicting information
-                    if self._has_conflicting_information(fact, source_text):
-                        if source_id not in conflicting_sources:
-                            conflicting_sources.append(source_id)
+                    if source_id not in conflicting_sources and self._has_conflicting_information(fact_lower, source):
+                        conflicting_sources[source_id] = None
         
         # Calculate verification score
         verification_score = self._calculate_verification_score(fact_scores, len(key_facts))
@@ -99,12 +317,12 @@ class SourceVerifier:
         # Determine if information is verified
         is_verified = verification_score >= 0.7 and len(supporting_sources) >= 2
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             is_verified=is_verified,
             confidence_score=verification_score,
             verification_method="cross_reference",
-            supporting_sources=supporting_sources,
-            conflicting_sources=conflicting_sources,
+            supporting_sources=list(supporting_sources),
+            conflicting_sources=list(conflicting_sources),
             verification_details={
                 "key_facts": key_facts,
                 "fact_scores": fact_scores
@@ -113,48 +331,16 @@ class SourceVerifier:
     
     def _fact_checking_verification(self, 
                                    information: str, 
-                                   sources: List[Dict[str, Any]]) -> VerificationResult:
+                                   sources: List[_PreparedSource]) -> VerificationResult:
         """
         Verify information using fact-checking techniques.
         
         This method implements basic fact-checking by looking for
         specific patterns and inconsistencies in the information.
         """
-        # Check for common misinformation patterns
-        misinformation_patterns = [
-            r"conspiracy",
-            r"hoax",
-            r"fake news",
-            r"misinformation",
-            r"disinformation",
-            r"unverified",
-            r"unconfirmed",
-            r"rumor",
-            r"speculation"
-        ]
-        
-        # Check for reliable information patterns
-        reliable_patterns = [
-            r"according to",
-            r"reported by",
-            r"confirmed by",
-            r"verified",
-            r"official",
-            r"statement",
-            r"announcement",
-            r"press release"
-        ]
-        
-        # Count occurrences of each pattern
-        misinformation_count = sum(
-            len(re.findall(pattern, information.lower())) 
-            for pattern in misinformation_patterns
-        )
-        
-        reliable_count = sum(
-            len(re.findall(pattern, information.lower())) 
-            for pattern in reliable_patterns
-        )
+        # Count occurrences of misinformation and reliable-reporting patterns
+        misinformation_count = len(_MISINFORMATION_RE.findall(information))
+        reliable_count = len(_RELIABLE_RE.findall(information))
         
         # Calculate verification score
         total_patterns = misinformation_count + reliable_count
@@ -166,7 +352,7 @@ class SourceVerifier:
         # Determine if information is verified
         is_verified = verification_score >= 0.7
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             is_verified=is_verified,
             confidence_score=verification_score,
             verification_method="fact_checking",
@@ -180,72 +366,36 @@ class SourceVerifier:
     
     def _source_credibility_verification(self, 
                                         information: str, 
-                                        sources: List[Dict[str, Any]]) -> VerificationResult:
+                                        sources: List[_PreparedSource]) -> VerificationResult:
         """
         Verify information based on source credibility.
         
         This method assesses the credibility of sources based on
         various factors such as domain reputation, author credentials, etc.
         """
-        # Define credible domains (in a real implementation, this would be more extensive)
-        credible_domains = [
-            "reuters.com",
-            "apnews.com",
-            "bbc.com",
-            "nytimes.com",
-            "washingtonpost.com",
-            "theguardian.com",
-            "cnn.com",
-            "npr.org",
-            "scientificamerican.com",
-            "nature.com",
-            "science.org",
-            "who.int",
-            "cdc.gov",
-            "nih.gov",
-            "gov",
-            "edu"
-        ]
-        
-        # Define less credible domains
-        less_credible_domains = [
-            "blogspot.com",
-            "wordpress.com",
-            "medium.com",
-            "tumblr.com",
-            "facebook.com",
-            "twitter.com",
-            "instagram.com",
-            "tiktok.com"
-        ]
+        if not sources:
+            return self._neutral_result(
+                "source_credibility",
+                {"credible_sources_count": 0, "less_credible_sources_count": 0}
+            )
         
         # Assess source credibility
         credible_sources = []
         less_credible_sources = []
         
         for source in sources:
-            source_url = source.get("link", "")
-            source_id = source.get("id", "")
-            
-            is_credible = any(domain in source_url for domain in credible_domains)
-            is_less_credible = any(domain in source_url for domain in less_credible_domains)
-            
-            if is_credible:
-                credible_sources.append(source_id)
-            elif is_less_credible:
-                less_credible_sources.append(source_id)
+            if not _CREDIBLE_DOMAINS.isdisjoint(source.domains):
+                credible_sources.append(source.id)
+            elif not _LESS_CREDIBLE_DOMAINS.isdisjoint(source.domains):
+                less_credible_sources.append(source.id)
         
         # Calculate verification score
-        total_sources = len(sources)
-        if total_sources == 0:
-            verification_score = 0.5  # Neutral score if no sources
-        else:
-            verification_score = len(credible_sources) / total_sources
+        verification_score = len(credible_sources) / len(sources)
         
         # Determine if information is verified
         is_verified = verification_score >= 0.7 and len(credible_sources) >= 2
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             is_verified=is_verified,
             confidence_score=verification_score,
             verification_method="source_credibility",
@@ -259,7 +409,7 @@ class SourceVerifier:
     
     def _temporal_analysis_verification(self, 
                                        information: str, 
-                                       sources: List[Dict[str, Any]]) -> VerificationResult:
+                                       sources: List[_PreparedSource]) -> VerificationResult:
         """
         Verify information using temporal analysis.
         
@@ -267,42 +417,31 @@ class SourceVerifier:
         if information has evolved or been corrected over time.
         """
         # Extract dates from sources
-        dated_sources = []
-        for source in sources:
-            if "date" in source:
-                try:
-                    date = datetime.fromisoformat(source["date"].replace("Z", "+00:00"))
-                    dated_sources.append((source["id"], date))
-                except (ValueError, TypeError):
-                    pass
-        
-        # Sort sources by date
-        dated_sources.sort(key=lambda x: x[1])
-        
-        # Check for information evolution
-        information_evolution = []
-        if len(dated_sources) >= 2:
-            for i in range(1, len(dated_sources)):
-                source_id = dated_sources[i][0]
-                source = next((s for s in sources if s["id"] == source_id), None)
-                if source:
-                    information_evolution.append(source_id)
+        dated = [source for source in sources if source.timestamp is not None]
+        if not dated:
+            return self._neutral_result(
+                "temporal_analysis",
+                {"dated_sources_count": 0, "information_evolution": []}
+            )
+        timestamps = np.fromiter((source.timestamp for source in dated), dtype=np.float64, count=len(dated))
         
-        # Calculate verification score
-        if len(dated_sources) == 0:
-            verification_score = 0.5  # Neutral score if no dated sources
-        else:
-            # Higher score if information is consistent across time
-            verification_score = 1.0 - (len(information_evolution) / len(dated_sources))
+        # Sort sources by date (stable, so same-time sources keep their order)
+        dated_sources = [dated[i].id for i in np.argsort(timestamps, kind="stable")]
+        
+        # Check for information evolution: every source after the earliest reports later
+        information_evolution = dated_sources[1:]
+        
+        # Calculate verification score: higher if information is consistent across time
+        verification_score = 1.0 - (len(information_evolution) / len(dated_sources))
         
         # Determine if information is verified
         is_verified = verification_score >= 0.7 and len(dated_sources) >= 2
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             is_verified=is_verified,
             confidence_score=verification_score,
             verification_method="temporal_analysis",
-            supporting_sources=[s[0] for s in dated_sources],
+            supporting_sources=dated_sources,
             conflicting_sources=information_evolution,
             verification_details={
                 "dated_sources_count": len(dated_sources),
@@ -312,7 +451,7 @@ class SourceVerifier:
     
     def _stimulated_verification(self, 
                                 information: str, 
-                                sources: List[Dict[str, Any]]) -> VerificationResult:
+                                sources: List[_PreparedSource]) -> VerificationResult:
         """
         Verify information using stimulated verification techniques.
         
@@ -327,37 +466,29 @@ class SourceVerifier:
         temporal_result = self._temporal_analysis_verification(information, sources)
         
         # Calculate weighted verification score
-        weights = {
-            "cross_reference": 0.3,
-            "fact_checking": 0.2,
-            "source_credibility": 0.3,
-            "temporal_analysis": 0.2
-        }
-        
-        verification_score = (
-            cross_ref_result.confidence_score * weights["cross_reference"] +
-            fact_check_result.confidence_score * weights["fact_checking"] +
-            source_cred_result.confidence_score * weights["source_credibility"] +
-            temporal_result.confidence_score * weights["temporal_analysis"]
+        results = (cross_ref_result, fact_check_result, source_cred_result, temporal_result)
+        verification_score = sum(
+            result.confidence_score * weight
+            for result, weight in zip(results, _STIMULATED_WEIGHTS)
         )
         
-        # Combine supporting and conflicting sources
-        supporting_sources = list(set(
-            cross_ref_result.supporting_sources +
-            source_cred_result.supporting_sources +
+        # Combine supporting and conflicting sources (deduplicated, in first-seen order)
+        supporting_sources = list(dict.fromkeys(chain(
+            cross_ref_result.supporting_sources,
+            source_cred_result.supporting_sources,
             temporal_result.supporting_sources
-        ))
+        )))
         
-        conflicting_sources = list(set(
-            cross_ref_result.conflicting_sources +
-            source_cred_result.conflicting_sources +
+        conflicting_sources = list(dict.fromkeys(chain(
+            cross_ref_result.conflicting_sources,
+            source_cred_result.conflicting_sources,
             temporal_result.conflicting_sources
-        ))
+        )))
         
         # Determine if information is verified
         is_verified = verification_score >= 0.7 and len(supporting_sources) >= 2
         
-        return VerificationResult(
+        return VerificationResult.model_construct(
             is_verified=is_verified,
             confidence_score=verification_score,
             verification_method="stimulated_verification",
@@ -371,59 +502,51 @@ class SourceVerifier:
             }
         )
     
+    def _neutral_result(self, method: str, details: Dict[str, Any]) -> VerificationResult:
+        """Build the neutral (0.5, unverified) result a method gives when it has nothing to assess."""
+        return VerificationResult.model_construct(
+            is_verified=False,
+            confidence_score=0.5,
+            verification_method=method,
+            supporting_sources=[],
+            conflicting_sources=[],
+            verification_details=details
+        )
+    
     def _extract_key_facts(self, information: str) -> List[str]:
         """Extract key facts from information text."""
         # Simple implementation - split by sentences and filter
-        sentences = re.split(r'[.!?]+', information)
-        key_facts = [s.strip() for s in sentences if len(s.strip()) > 10]
-        return key_facts
+        sentences = (s.strip() for s in _SENTENCE_END_RE.split(information))
+        return [s for s in sentences if len(s) > 10]
     
-    def _has_conflicting_information(self, fact: str, text: str) -> bool:
-        """Check if text contains information conflicting with the fact."""
-        # Simple implementation - look for negation patterns
-        negation_patterns = [
-            r"not",
-            r"never",
-            r"didn't",
-            r"doesn't",
-            r"haven't",
-            r"hasn't",
-            r"won't",
-            r"wouldn't",
-            r"couldn't",
-            r"shouldn't",
-            r"isn't",
-            r"aren't",
-            r"wasn't",
-            r"weren't"
-        ]
-        
-        # Check if text contains the fact and a negation
-        has_fact = fact.lower() in text.lower()
-        has_negation = any(pattern in text.lower() for pattern in negation_patterns)
-        
-        return has_fact and has_negation
+    def _build_fact_matcher(self, key_facts: List[str]) -> Callable[[str], Set[str]]:
+        """Build a function that returns which key facts occur in a text."""
+        if ahocorasick is None or not key_facts:
+            return lambda text: {fact for fact in key_facts if fact in text}
+        
+        automaton = ahocorasick.Automaton()
+        for fact in key_facts:
+            automaton.add_word(fact, fact)
+        automaton.make_automaton()
+        return lambda text: {fact for _, fact in automaton.iter(text)}
+    
+    def _has_conflicting_information(self, fact_lower: str, source: _PreparedSource) -> bool:
+        """Check if a source contains information conflicting with the (lowercased) fact."""
+        # Simple implementation - the source mentions the fact and contains a negation
+        return source.has_negation and fact_lower in source.text_lower
     
     def _calculate_verification_score(self, fact_scores: Dict[str, List[str]], total_facts: int) -> float:
         """Calculate verification score based on fact scores."""
         if total_facts == 0:
             return 0.5  # Neutral score if no facts
             
-        # Calculate score for each fact
-        fact_verification_scores = []
-        for fact, sources in fact_scores.items():
-            # More sources = higher score
-            source_count = len(sources)
-            if source_count >= 3:
-                fact_score = 1.0
-            elif source_count == 2:
-                fact_score = 0.8
-            elif source_count == 1:
-                fact_score = 0.5
-            else:
-                fact_score = 0.0
-                
-            fact_verification_scores.append(fact_score)
+        # More sources = higher score, looked up for every fact at once
+        source_counts = np.fromiter(
+            (len(sources) for sources in fact_scores.values()),
+            dtype=np.intp,
+            count=len(fact_scores)
+        )
+        fact_verification_scores = _FACT_SCORE_BY_SOURCE_COUNT[np.minimum(source_counts, 3)]
         
         # Calculate overall score
-        return sum(fact_verification_scores) / total_facts 
\ No newline at end of file
+        return float(fact_verification_scores.sum()) / total_facts 
\ No newline at end of file
@@ -4,9 +4,8 @@ Example script demonstrating the verification features of the SourceFinder API.
 This script shows how to use the API to verify information across multiple sources.
 """
 
-import requests
-import json
-import os
+import asyncio
+import aiohttp
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,11 +14,15 @@ load_dotenv()
 # API endpoint
 API_URL = "http://localhost:8000"
 
-def process_query_with_verification(query, verification_method="stimulated_verification"):
+# Queries run concurrently, so give each one room for a full search and answer
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=120)
+
+async def process_query_with_verification(session, query, verification_method="stimulated_verification"):
     """
     Process a query with verification.
     
     Args:
+        session: The aiohttp session to send the request with
         query: The query to process
         verification_method: The verification method to use
         
@@ -37,15 +40,18 @@ def process_query_with_verification(query, verification_method="stimulated_verif
         "verification_method": verification_method
     }
     
-    # Send request
-    response = requests.post(url, headers=headers, json=data)
-    
-    # Parse response
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
+    # Send request; one failed request shouldn't abort the others running alongside it
+    try:
+        async with session.post(url, headers=headers, json=data) as response:
+            # Parse response
+            if response.status == 200:
+                return await response.json()
+            else:
+                print(f"Error: {response.status}")
+                print(await response.text())
+                return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error: {e}")
         return None
 
 def print_verification_result(result):
@@ -66,15 +72,17 @@ def print_verification_result(result):
     print(f"Confidence Score: {verification['confidence_score']:.2f}")
     print(f"Verification Method: {verification['verification_method']}")
     
+    sources_by_id = {s["id"]: s for s in result["sources"]}
+    
     print("\nSupporting Sources:")
     for source_id in verification["supporting_sources"]:
-        source = next((s for s in result["sources"] if s["id"] == source_id), None)
+        source = sources_by_id.get(source_id)
         if source:
             print(f"- {source['title']} ({source['source_type']})")
     
     print("\nConflicting Sources:")
     for source_id in verification["conflicting_sources"]:
-        source = next((s for s in result["sources"] if s["id"] == source_id), None)
+        source = sources_by_id.get(source_id)
         if source:
             print(f"- {source['title']} ({source['source_type']})")
     
@@ -85,7 +93,7 @@ def print_verification_result(result):
         else:
             print(f"- {key}: {value}")
 
-def main():
+async def main():
     """Main function."""
     # Example queries
     queries = [
@@ -103,20 +111,25 @@ def main():
         "stimulated_verification"
     ]
     
-    # Process each query with each verification method
-    for query in queries:
-        print(f"\n\n=== Query: {query} ===")
+    # Process every query with every verification method at once
+    pairs = [(query, method) for query in queries for method in verification_methods]
+    async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
+        results = await asyncio.gather(*(
+            process_query_with_verification(session, query, method) for query, method in pairs
+        ))
+    
+    # Print the results in query order
+    for (query, method), result in zip(pairs, results):
+        if method == verification_methods[0]:
+            print(f"\n\n=== Query: {query} ===")
         
-        for method in verification_methods:
-            print(f"\n--- Verification Method: {method} ---")
-            result = process_query_with_verification(query, method)
-            
-            if result:
-                print("\nResponse:")
-                print(result["response"])
-                print_verification_result(result)
-            else:
-                print("Failed to process query")
+        print(f"\n--- Verification Method: {method} ---")
+        if result:
+            print("\nResponse:")
+            print(result["response"])
+            print_verification_result(result)
+        else:
+            print("Failed to process query")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
@@ -2,8 +2,40 @@
 Entry script for running the SourceFinder API.
 """
 
+import os
+import sys
+
 import uvicorn
 
+from app.config.settings import settings
+
+
+def worker_count() -> int:
+    """Number of server processes to run when DEBUG is off.
+
+    Without REDIS_URL each process keeps its own chat sessions, so only a
+    single worker is allowed.
+    """
+    if settings.REDIS_URL:
+        return settings.WORKERS or os.cpu_count() or 1
+    if settings.WORKERS and settings.WORKERS > 1:
+        sys.exit("❌ WORKERS > 1 requires REDIS_URL so workers share chat sessions")
+    return 1
+
+
 if __name__ == "__main__":
     print("Starting SourceFinder API...")
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    if settings.DEBUG:
+        # Development: one auto-reloading process (uvloop/httptools when installed)
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Production: one worker per CPU with Redis, a single worker without it
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=worker_count(),
+            loop="uvloop",
+            http="httptools",
+            access_log=False
+        )
\ No newline at end of file